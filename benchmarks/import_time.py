@@ -0,0 +1,69 @@
+"""
+Measures the cold start of processes that import discord_components, each in a fresh interpreter.
+
+    python benchmarks/import_time.py --runs 10
+"""
+
+from argparse import ArgumentParser
+from os import environ, pathsep
+from pathlib import Path
+from statistics import median
+from subprocess import run
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CASES = {
+    "import discord_components": "import discord_components",
+    "build and serialize a layout": (
+        "from discord_components import ActionRow, Button, Layout, Select, Option\n"
+        "Layout(ActionRow(Button(label='a'), Button(label='b')),"
+        " ActionRow(Select(options=[Option(label='x', value='x')]))).to_dict()"
+    ),
+    "import DiscordComponents": "from discord_components import DiscordComponents",
+    "import discord (baseline)": "import discord",
+}
+
+PROBE = """
+from time import perf_counter
+import sys
+started = perf_counter()
+exec(compile({code!r}, "<bench>", "exec"))
+elapsed = perf_counter() - started
+print(elapsed, "discord" in sys.modules)
+"""
+
+
+def measure(code: str, runs: int):
+    env = {
+        **environ,
+        "PYTHONPATH": pathsep.join(filter(None, (str(ROOT), environ.get("PYTHONPATH")))),
+    }
+    timings = []
+    for _ in range(runs):
+        output = run(
+            [sys.executable, "-c", PROBE.format(code=code)],
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+    return median(timings), output[1] == "True"
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, code in CASES.items():
+        elapsed, loaded_discord = measure(code, args.runs)
+        print(
+            f"{name:<30} {elapsed * 1000:>8.1f} ms"
+            f"  (discord {'imported' if loaded_discord else 'not imported'})"
+        )
+
+
+if __name__ == "__main__":
+    main()
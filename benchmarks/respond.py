@@ -0,0 +1,93 @@
+"""
+Measures CPU time and transient memory of building and sending one response.
+
+    python benchmarks/respond.py --count 20000
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from time import perf_counter
+import tracemalloc
+
+from discord import AllowedMentions, Embed, Object
+from discord_components import DiscordComponents, Button, Interaction, ResponseTemplate
+
+
+class HTTP:
+    async def request(self, route, **kwargs):
+        pass
+
+
+class State:
+    allowed_mentions = AllowedMentions(everyone=False, users=True, roles=False)
+
+
+class Bot:
+    def __init__(self):
+        self.http = HTTP()
+        self._connection = State()
+
+
+async def measure(name, count, client, respond):
+    interactions = [
+        Interaction(
+            bot=client.bot,
+            client=client,
+            component=None,
+            raw_data={"d": {"id": str(i), "token": "token"}},
+        )
+        for i in range(count)
+    ]
+
+    started = perf_counter()
+    for interaction in interactions:
+        await respond(interaction)
+    elapsed = perf_counter() - started
+
+    for interaction in interactions:
+        interaction.responded = False
+    tracemalloc.start()
+    peak = 0
+    for interaction in interactions[:1000]:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await respond(interaction)
+        peak += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    print(f"{name:<10} {elapsed / count * 1e6:>8.2f} us/respond  {peak / 1000:>8.0f} B peak/respond")
+
+
+async def main(args):
+    client = DiscordComponents(Bot(), change_discord_methods=False)
+    embed = Embed(title="Result", description="Something happened")
+    mentions = AllowedMentions(users=[Object(1), Object(2)])
+    components = [[Button(label="Retry", id="retry"), Button(label="Cancel", id="cancel")]]
+
+    await measure(
+        "respond",
+        args.count,
+        client,
+        lambda interaction: interaction.respond(
+            content=f"Hello {interaction.interaction_id}",
+            embed=embed,
+            allowed_mentions=mentions,
+            components=components,
+        ),
+    )
+
+    template = ResponseTemplate(
+        "Hello {name}", embed=embed, allowed_mentions=mentions, components=components
+    )
+    await measure(
+        "template",
+        args.count,
+        client,
+        lambda interaction: template.respond(interaction, name=interaction.interaction_id),
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""
+Compares the CPU cost of Messageable.send before and after DiscordComponents patches it.
+
+    python benchmarks/send.py --count 20000
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from time import perf_counter
+
+from discord import Client
+from discord.abc import Messageable
+from discord_components import DiscordComponents, Button
+
+
+def message_payload(channel_id, json):
+    return {
+        "id": "1",
+        "channel_id": str(channel_id),
+        "content": json.get("content") or "",
+        "author": {"id": "2", "username": "bot", "discriminator": "0001", "avatar": None},
+        "timestamp": "2021-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        "components": json.get("components") or [],
+    }
+
+
+class Channel(Messageable):
+    def __init__(self, state, id):
+        self._state = state
+        self.id = id
+        self.guild = None
+
+    async def _get_channel(self):
+        return self
+
+
+async def measure(name, count, send):
+    started = perf_counter()
+    for i in range(count):
+        await send(i)
+    elapsed = perf_counter() - started
+    print(f"{name:<24} {elapsed / count * 1e6:>8.2f} us/send")
+
+
+async def main(args):
+    bot = Client()
+
+    async def request(route, **kwargs):
+        return message_payload(1, kwargs.get("json") or {})
+
+    bot.http.request = request
+    channel = Channel(bot._connection, 1)
+    buttons = [Button(label="A", id="a")]
+
+    await measure("discord.py", args.count, lambda i: channel.send(f"message {i}"))
+
+    DiscordComponents(bot, add_listener=False)
+    await measure("patched", args.count, lambda i: channel.send(f"message {i}"))
+    await measure(
+        "patched, components",
+        args.count,
+        lambda i: channel.send(f"message {i}", components=buttons),
+    )
+
+    await bot.close()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Measures send/edit/respond throughput against the local mock API.
+
+    python benchmarks/throughput.py --count 200 --rate-limit 50 --per 1
+"""
+
+from argparse import ArgumentParser
+from asyncio import gather, run
+from time import perf_counter
+
+from discord import Client
+from discord_components import DiscordComponents, Button, Interaction
+from discord_components.mock import MockDiscordServer
+
+
+class Channel:
+    def __init__(self, id):
+        self.id = id
+        self.guild = None
+
+    async def _get_channel(self):
+        return self
+
+
+async def measure(name, count, coro_factory):
+    started = perf_counter()
+    results = await gather(*(coro_factory(i) for i in range(count)))
+    elapsed = perf_counter() - started
+    print(f"{name:<8} {count / elapsed:>10.1f} req/s  ({elapsed:.2f}s for {count})")
+    return results
+
+
+async def main(args):
+    async with MockDiscordServer(
+        rate_limit=args.rate_limit,
+        per=args.per,
+        global_rate_limit=args.global_rate_limit,
+        latency=args.latency,
+    ) as server:
+        with server.patch_route():
+            bot = Client()
+            await bot.login("mock")
+            client = DiscordComponents(bot, change_discord_methods=False)
+            channels = [Channel(i + 1) for i in range(args.channels)]
+
+            messages = await measure(
+                "send",
+                args.count,
+                lambda i: client.send_component_msg(
+                    channels[i % len(channels)], f"message {i}", components=[Button(label="A")]
+                ),
+            )
+            await measure(
+                "edit",
+                args.count,
+                lambda i: client.edit_component_msg(
+                    messages[i], "edited", components=[Button(label="B")]
+                ),
+            )
+            await measure(
+                "respond",
+                args.count,
+                lambda i: Interaction(
+                    bot=bot,
+                    client=client,
+                    component=None,
+                    raw_data={"d": {"id": str(i), "token": "token"}},
+                ).respond(content="pong"),
+            )
+
+            print(f"requests {server.requests}, rate limited {server.rate_limited}")
+            await bot.close()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--rate-limit", type=int, default=5)
+    parser.add_argument("--per", type=float, default=5.0)
+    parser.add_argument("--global-rate-limit", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    run(main(parser.parse_args()))
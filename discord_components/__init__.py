@@ -1,11 +1,86 @@
-from .client import *
-from .button import *
-from .select import *
-from .interaction import *
-from .component import *
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __name__ = "discord_components"
 __version__ = "0.5.3"
 
 __author__ = "kiki7000"
 __license__ = "MIT"
+
+
+# Submodules are imported when one of their names is first accessed, so a process that only
+# builds components never imports discord.py, and the client's dependencies load with it.
+_exports = {
+    "client": ("DiscordComponents",),
+    "button": ("ButtonStyle", "Button"),
+    "select": ("Select", "Option"),
+    "interaction": ("Interaction", "InteractionType", "InteractionEventType", "FlagsType"),
+    "component": ("Component",),
+    "analytics": ("Analytics", "AnalyticsSink", "JSONLinesSink", "SQLiteSink", "CallbackSink"),
+    "cooldown": ("BucketType", "Cooldown", "CooldownStore", "cooldown", "bucket_key"),
+    "dedup": ("DedupBackend", "MemoryDedupBackend", "Deduplicator"),
+    "eviction": ("EvictionIndex",),
+    "grid": ("ComponentGrid",),
+    "layout": ("ActionRow", "Layout"),
+    "locking": ("LockPool", "serialized"),
+    "paginator": ("Paginator",),
+    "poll": ("Poll",),
+    "profiler": ("Profiler",),
+    "render": ("Renderer",),
+    "replay": ("Recorder", "Replayer", "StubHTTPClient"),
+    "routing": ("on_click", "on_select", "Router"),
+    "scheduler": ("RequestClass", "RequestScheduler"),
+    "provider": ("OptionProvider", "DynamicSelect", "SelectChain"),
+    "session": ("Session", "SessionManager"),
+    "store": ("StateBackend", "SQLiteBackend", "StateStore"),
+    "template": ("ResponseTemplate",),
+    "validation": ("validate_components",),
+}
+_modules = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = tuple(_modules)
+
+
+# Shares its name with its submodule, which would otherwise shadow it once imported.
+from .cooldown import cooldown
+
+
+def __getattr__(name: str):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING:
+    from .client import *
+    from .button import *
+    from .select import *
+    from .interaction import *
+    from .component import *
+    from .analytics import *
+    from .cooldown import *
+    from .dedup import *
+    from .eviction import *
+    from .grid import *
+    from .layout import *
+    from .locking import *
+    from .paginator import *
+    from .poll import *
+    from .profiler import *
+    from .render import *
+    from .replay import *
+    from .routing import *
+    from .scheduler import *
+    from .provider import *
+    from .session import *
+    from .store import *
+    from .template import *
+    from .validation import *
@@ -0,0 +1,220 @@
+from asyncio import CancelledError, ensure_future, get_running_loop, iscoroutine, sleep
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps
+from time import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import sqlite3
+
+from .cooldown import BucketType, bucket_key
+
+
+__all__ = ("Analytics", "AnalyticsSink", "JSONLinesSink", "SQLiteSink", "CallbackSink")
+
+
+_CLICK, _RESPONSE = 0, 1
+
+
+class AnalyticsSink:
+    """Receives one row per custom_id for every flushed window."""
+
+    async def write(self, rows: List[Dict[str, Any]]):
+        raise NotImplementedError()
+
+    async def close(self):
+        pass
+
+
+class _ThreadedSink(AnalyticsSink):
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        raise NotImplementedError()
+
+    def _close(self):
+        pass
+
+    async def write(self, rows: List[Dict[str, Any]]):
+        await get_running_loop().run_in_executor(self._executor, self._write, rows)
+
+    async def close(self):
+        await get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=False)
+
+
+class JSONLinesSink(_ThreadedSink):
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        with open(self.path, "a", encoding="utf-8") as file:
+            for row in rows:
+                file.write(dumps(row, separators=(",", ":"), ensure_ascii=False))
+                file.write("\n")
+
+
+class SQLiteSink(_ThreadedSink):
+    _COLUMNS = (
+        "window_start",
+        "window_end",
+        "custom_id",
+        "clicks",
+        "unique_users",
+        "responses",
+        "latency_avg_ms",
+        "latency_max_ms",
+    )
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS component_clicks "
+                "(window_start REAL, window_end REAL, custom_id TEXT, clicks INTEGER, "
+                "unique_users INTEGER, responses INTEGER, latency_avg_ms REAL, "
+                "latency_max_ms REAL)"
+            )
+
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO component_clicks VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                [tuple(row[column] for column in self._COLUMNS) for row in rows],
+            )
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class CallbackSink(AnalyticsSink):
+    def __init__(self, callback: Callable[[List[Dict[str, Any]]], Any]):
+        self.callback = callback
+
+    async def write(self, rows: List[Dict[str, Any]]):
+        result = self.callback(rows)
+        if iscoroutine(result):
+            await result
+
+
+class Analytics:
+    """Counts clicks, unique users and response latency per custom_id off the hot path.
+
+    Assign one to ``DiscordComponents.analytics``. Each interaction only
+    appends a small tuple to a buffer of ``capacity`` records; once it is
+    full new records are dropped and counted in ``dropped``. Every
+    ``flush_interval`` seconds a background task aggregates the buffer into
+    one row per custom_id and hands the rows to every sink.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[AnalyticsSink],
+        *,
+        capacity: int = 10_000,
+        flush_interval: float = 10.0,
+    ):
+        self.sinks = list(sinks)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.flushed = 0
+        self.sink_errors = 0
+
+        self._buffer: deque = deque()
+        self._window_start = time()
+        self._task = None
+
+    def _push(self, record: tuple):
+        if len(self._buffer) >= self.capacity:
+            self.dropped += 1
+            return
+        self._buffer.append(record)
+        if self._task is None:
+            self._task = ensure_future(self._run())
+
+    def click(self, data: dict):
+        self._push((_CLICK, data["data"]["custom_id"], bucket_key(BucketType.user, data), 0.0))
+
+    def response(self, data: dict, latency: float):
+        self._push(
+            (_RESPONSE, data["data"]["custom_id"], bucket_key(BucketType.user, data), latency)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": len(self._buffer),
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "sink_errors": self.sink_errors,
+        }
+
+    def _aggregate(self, records: List[tuple], window_end: float) -> List[Dict[str, Any]]:
+        totals: Dict[str, list] = {}
+        for kind, custom_id, user_id, latency in records:
+            total = totals.get(custom_id)
+            if total is None:
+                total = totals[custom_id] = [0, set(), 0, 0.0, 0.0]
+            if kind == _CLICK:
+                total[0] += 1
+                total[1].add(user_id)
+            else:
+                total[2] += 1
+                total[3] += latency
+                total[4] = max(total[4], latency)
+
+        return [
+            {
+                "window_start": self._window_start,
+                "window_end": window_end,
+                "custom_id": custom_id,
+                "clicks": clicks,
+                "unique_users": len(users),
+                "responses": responses,
+                "latency_avg_ms": round(latency_sum / responses * 1000, 3) if responses else None,
+                "latency_max_ms": round(latency_max * 1000, 3) if responses else None,
+            }
+            for custom_id, (clicks, users, responses, latency_sum, latency_max) in totals.items()
+        ]
+
+    async def flush(self):
+        records = list(self._buffer)
+        self._buffer.clear()
+        window_end = time()
+        rows = self._aggregate(records, window_end)
+        self._window_start = window_end
+        if not rows:
+            return
+
+        for sink in self.sinks:
+            try:
+                await sink.write(rows)
+            except Exception:
+                self.sink_errors += 1
+        self.flushed += len(records)
+
+    async def _run(self):
+        while True:
+            await sleep(self.flush_interval)
+            await self.flush()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        for sink in self.sinks:
+            await sink.close()
@@ -1,10 +1,18 @@
-from discord import InvalidArgument, PartialEmoji, Emoji
-
-from typing import Optional, Union
-from uuid import uuid1
+from typing import TYPE_CHECKING, Optional, Union
 from random import randint
 
-from .component import Component
+from .component import (
+    Component,
+    _clone_emoji,
+    _emoji_from_json,
+    _intern,
+    _invalid_argument,
+    _new_id,
+    _partial_emoji,
+)
+
+if TYPE_CHECKING:
+    from discord import Emoji, PartialEmoji
 
 
 __all__ = ("ButtonStyle", "Button")
@@ -44,34 +52,21 @@ class Button(Component):
         id: str = None,
         url: str = None,
         disabled: bool = False,
-        emoji: Union[Emoji, PartialEmoji, str] = None,
+        emoji: Union["Emoji", "PartialEmoji", str] = None,
     ):
         if style == ButtonStyle.URL and not url:
-            raise InvalidArgument("You must provide a URL when the style is set to URL.")
+            raise _invalid_argument("You must provide a URL when the style is set to URL.")
         if style == ButtonStyle.URL and id:
-            raise InvalidArgument("Both ID and URL are set.")
-        if not (1 <= style <= ButtonStyle.URL):
-            raise InvalidArgument(f"Style must be between 1, {ButtonStyle.URL}.")
-
-        if not label and not emoji:
-            raise InvalidArgument(f"Label or emoji must be given.")
+            raise _invalid_argument("Both ID and URL are set.")
 
         self._style = style
         self._label = label
         self._url = url
         self._disabled = disabled
-
-        if isinstance(emoji, Emoji):
-            self._emoji = PartialEmoji(name=emoji.name, animated=emoji.animated, id=emoji.id)
-        elif isinstance(emoji, PartialEmoji):
-            self._emoji = emoji
-        elif isinstance(emoji, str):
-            self._emoji = PartialEmoji(name=emoji)
-        else:
-            self._emoji = None
+        self._emoji = _partial_emoji(emoji)
 
         if not self.style == ButtonStyle.URL:
-            self._id = id or str(uuid1())
+            self._id = id or _new_id()
         else:
             self._id = None
 
@@ -88,6 +83,16 @@ class Button(Component):
             data["emoji"] = self.emoji.to_dict()
         return data
 
+    def _clone(self) -> "Button":
+        button = Button.__new__(Button)
+        button._style = self._style
+        button._label = self._label
+        button._id = self._id
+        button._url = self._url
+        button._disabled = self._disabled
+        button._emoji = _clone_emoji(self._emoji)
+        return button
+
     @property
     def style(self) -> int:
         return self._style
@@ -109,36 +114,31 @@ class Button(Component):
         return self._disabled
 
     @property
-    def emoji(self) -> PartialEmoji:
+    def emoji(self) -> "PartialEmoji":
         return self._emoji
 
     @style.setter
     def style(self, value: int):
         if value == ButtonStyle.URL and self.id:
-            raise InvalidArgument("Both ID and URL are set.")
-        if not (1 <= value <= ButtonStyle.URL):
-            raise InvalidArgument(f"Style must be between 1, {ButtonStyle.URL}.")
+            raise _invalid_argument("Both ID and URL are set.")
 
         self._style = value
 
     @label.setter
     def label(self, value: str):
-        if not value and not self.emoji:
-            raise InvalidArgument("Label should not be empty.")
-
         self._label = value
 
     @url.setter
     def url(self, value: str):
         if value and self.style != ButtonStyle.URL:
-            raise InvalidArgument("Button style is not URL. You shouldn't provide URL.")
+            raise _invalid_argument("Button style is not URL. You shouldn't provide URL.")
 
         self._url = value
 
     @id.setter
     def id(self, value: str):
         if self.style == ButtonStyle.URL:
-            raise InvalidArgument("Button style is set to URL. You shouldn't provide ID.")
+            raise _invalid_argument("Button style is set to URL. You shouldn't provide ID.")
 
         self._id = value
 
@@ -147,26 +147,19 @@ class Button(Component):
         self._disabled = value
 
     @emoji.setter
-    def emoji(self, emoji: Union[Emoji, PartialEmoji, str]):
-        if isinstance(emoji, Emoji):
-            self._emoji = PartialEmoji(name=emoji.name, animated=emoji.animated, id=emoji.id)
-        elif isinstance(emoji, PartialEmoji):
+    def emoji(self, emoji: Union["Emoji", "PartialEmoji", str]):
+        emoji = _partial_emoji(emoji)
+        if emoji is not None:
             self._emoji = emoji
-        elif isinstance(emoji, str):
-            self._emoji = PartialEmoji(name=emoji)
 
     @staticmethod
     def from_json(data: dict):
-        emoji = data.get("emoji")
-        return Button(
-            style=data["style"],
-            label=data.get("label"),
-            id=data.get("custom_id"),
-            url=data.get("url"),
-            disabled=data.get("disabled", False),
-            emoji=PartialEmoji(
-                name=emoji["name"], animated=emoji.get("animated", False), id=emoji.get("id")
-            )
-            if emoji
-            else None,
-        )
+        # Payloads come from the API (or were serialized by us), so skip __init__'s checks.
+        button = Button.__new__(Button)
+        button._style = data["style"]
+        button._label = _intern(data.get("label"))
+        button._id = _intern(data.get("custom_id"))
+        button._url = data.get("url")
+        button._disabled = data.get("disabled", False)
+        button._emoji = _emoji_from_json(data.get("emoji"))
+        return button
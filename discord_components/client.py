@@ -8,70 +8,313 @@ from discord import (
     User,
     File,
 )
-from discord.ext.commands import Bot, Context as DContext
 from discord.http import Route
 from discord.abc import Messageable
 
 from functools import wraps
 from aiohttp import FormData
 from asyncio import TimeoutError
-from typing import List, Callable, Awaitable, Union
-from json import dumps
+from typing import TYPE_CHECKING, Any, List, Callable, Awaitable, Hashable, Optional, Tuple, Union
+from json import JSONEncoder, dumps
+from hashlib import blake2b
+from time import monotonic
+from weakref import WeakValueDictionary
+import sys
 
 from .button import Button
+from .cache import LRUCache
 from .select import Select
 from .component import Component
+from .cooldown import Cooldown, CooldownStore, bucket_key
+from .dedup import Deduplicator
+from .eviction import EvictionIndex
+from .grid import ComponentGrid
+from .layout import ActionRow, Layout
+from .locking import LockPool
 from .message import ComponentMessage
-from .interaction import Interaction, InteractionEventType
+from .interaction import INTERACTION_DEADLINE, Interaction, InteractionEventType, InteractionType
+from .profiler import Profiler
+from .render import Renderer
+from .routing import Router
+from .scheduler import RequestClass, RequestScheduler
+from .validation import validate_components
+
+if TYPE_CHECKING:
+    from discord.ext.commands import Bot
 
 
 __all__ = ("DiscordComponents",)
 
 
+# Discord serializes identical layouts identically, so key order needs no sorting.
+_layout_encoder = JSONEncoder(separators=(",", ":"), check_circular=False)
+
+
+def _mention_targets(value) -> Hashable:
+    if value is True or value is False:
+        return value
+    if hasattr(value, "__iter__"):
+        return tuple([target.id for target in value])
+    return None
+
+
+def _mentions_key(mentions: Optional[AllowedMentions]) -> Hashable:
+    # By value, since AllowedMentions objects are mutable and often rebuilt per call.
+    if mentions is None:
+        return None
+    return (
+        mentions.everyone if isinstance(mentions.everyone, bool) else None,
+        _mention_targets(mentions.users),
+        _mention_targets(mentions.roles),
+        mentions.replied_user if isinstance(mentions.replied_user, bool) else None,
+    )
+
+
+def _is_commands(obj, name: str) -> bool:
+    # An object can only be a commands.Bot or commands.Context once discord.ext.commands
+    # was imported, so bots that don't use the extension never pay for importing it.
+    commands = sys.modules.get("discord.ext.commands")
+    return commands is not None and isinstance(obj, getattr(commands, name))
+
+
+# Keyed by id(bot._connection). A client keeps its bot, and so the key, alive.
+_clients: "WeakValueDictionary[int, DiscordComponents]" = WeakValueDictionary()
+
+
+def _client_for(obj) -> "DiscordComponents":
+    client = _clients.get(id(getattr(obj, "_state", None)))
+    if client is None:
+        raise InvalidArgument(f"No DiscordComponents is attached to the bot owning {obj!r}.")
+    return client
+
+
+_DELETE_EVENTS = frozenset(
+    ("MESSAGE_DELETE", "MESSAGE_DELETE_BULK", "CHANNEL_DELETE", "GUILD_DELETE")
+)
+
+
 class DiscordComponents:
+    """Adds component support to a discord.py bot.
+
+    ``component_cache_size`` parsed messages are kept so repeated interactions
+    on the same message revision skip parsing. ``layout_cache_size`` (off by
+    default) shares one parsed tree between messages with identical
+    components. It only saves memory: computing its key costs more CPU than
+    parsing, and every interaction still gets its own copies of the
+    components.
+    """
+
     def __init__(
         self,
-        bot: Union[Bot, Client],
+        bot: Union["Bot", Client],
         change_discord_methods: bool = True,
         add_listener: bool = True,
+        validate: bool = True,
+        component_cache_size: int = 1024,
+        layout_cache_size: int = 0,
+        share_caches_with: "DiscordComponents" = None,
     ):
         self.bot = bot
+        self.profiler = Profiler()
+        self.recorder = None
+        self.analytics = None
+        self.validate = validate
+        if share_caches_with is not None:
+            # Message ids are unique across bots, so several bots can share parsed trees.
+            self.component_cache = share_caches_with.component_cache
+            self.layout_cache = share_caches_with.layout_cache
+            self.mentions_cache = share_caches_with.mentions_cache
+        else:
+            self.component_cache = LRUCache(component_cache_size)
+            self.layout_cache = LRUCache(layout_cache_size)
+            self.mentions_cache = LRUCache(256)
+        self.router = Router()
+        self.cooldowns: List[Cooldown] = []
+        self.cooldown_store = CooldownStore()
+        self.deduplicator = Deduplicator()
+        self.evictions = EvictionIndex()
+        self.scheduler = RequestScheduler()
+        self.locks = LockPool()
+        self.renderer = Renderer()
 
         if change_discord_methods:
             self.change_discord_methods(add_listener=add_listener)
+        if _is_commands(self.bot, "Bot"):
+            self._hook_cogs()
+
+    def _hook_cogs(self):
+        add_cog = getattr(self.bot.add_cog, "__wrapped__", self.bot.add_cog)
+        remove_cog = getattr(self.bot.remove_cog, "__wrapped__", self.bot.remove_cog)
+
+        @wraps(add_cog)
+        def add_cog_prop(cog, *args, **kwargs):
+            add_cog(cog, *args, **kwargs)
+            self.router.add_object(cog)
+
+        @wraps(remove_cog)
+        def remove_cog_prop(name, *args, **kwargs):
+            cog = self.bot.get_cog(name)
+            remove_cog(name, *args, **kwargs)
+            if cog is not None:
+                self.router.remove_object(cog)
+
+        self.bot.add_cog = add_cog_prop
+        self.bot.remove_cog = remove_cog_prop
+        for cog in self.bot.cogs.values():
+            self.router.add_object(cog)
+
+    def on_click(self, pattern: str):
+        def decorator(func):
+            self.router.add("button_click", pattern, func)
+            return func
+
+        return decorator
+
+    def on_select(self, pattern: str):
+        def decorator(func):
+            self.router.add("select_option", pattern, func)
+            return func
+
+        return decorator
 
     def change_discord_methods(self, add_listener: bool = True):
+        # Calls without components go straight to discord.py, keeping its full feature set.
+        # The rest are routed by the object's connection state, so every bot in the process
+        # sends through its own DiscordComponents.
+        send = getattr(Messageable.send, "__wrapped__", Messageable.send)
+        edit = getattr(Message.edit, "__wrapped__", Message.edit)
+        reply = getattr(Message.reply, "__wrapped__", Message.reply)
+
+        @wraps(send)
         async def send_component_msg_prop(ctxorchannel, *args, **kwargs) -> Message:
-            if isinstance(ctxorchannel, DContext):
-                return await self.send_component_msg(ctxorchannel.channel, *args, **kwargs)
+            if kwargs.get("components") is None:
+                kwargs.pop("components", None)
+                return await send(ctxorchannel, *args, **kwargs)
+
+            client = _client_for(ctxorchannel)
+            if _is_commands(ctxorchannel, "Context"):
+                return await client.send_component_msg(ctxorchannel.channel, *args, **kwargs)
             else:
-                return await self.send_component_msg(ctxorchannel, *args, **kwargs)
+                return await client.send_component_msg(ctxorchannel, *args, **kwargs)
 
-        async def edit_component_msg_prop(*args, **kwargs):
-            return await self.edit_component_msg(*args, **kwargs)
+        @wraps(edit)
+        async def edit_component_msg_prop(message, *args, **kwargs):
+            if kwargs.get("components") is None:
+                kwargs.pop("components", None)
+                return await edit(message, *args, **kwargs)
 
-        async def reply_component_msg_prop(msg, *args, **kwargs):
-            return await self.send_component_msg(msg.channel, *args, **kwargs, reference=msg)
+            return await _client_for(message).edit_component_msg(message, *args, **kwargs)
 
-        async def on_socket_response(res):
-            if (res["t"] != "INTERACTION_CREATE") or (res["d"]["type"] != 3):
-                return
+        @wraps(reply)
+        async def reply_component_msg_prop(msg, *args, **kwargs):
+            if kwargs.get("components") is None:
+                kwargs.pop("components", None)
+                return await reply(msg, *args, **kwargs)
 
-            ctx = self._get_interaction(res)
-            for key, value in InteractionEventType.items():
-                if value == res["d"]["data"]["component_type"]:
-                    self.bot.dispatch(key, ctx)
-                    break
+            return await _client_for(msg).send_component_msg(
+                msg.channel, *args, **kwargs, reference=msg
+            )
 
-        if isinstance(self.bot, Bot) and add_listener:
-            self.bot.add_listener(on_socket_response, name="on_socket_response")
+        if _is_commands(self.bot, "Bot") and add_listener:
+            self.bot.add_listener(self.on_socket_response, name="on_socket_response")
         else:
-            self.bot.on_socket_response = on_socket_response
+            self.bot.on_socket_response = self.on_socket_response
 
+        _clients[id(self.bot._connection)] = self
         Messageable.send = send_component_msg_prop
         Message.edit = edit_component_msg_prop
         Message.reply = reply_component_msg_prop
 
+    async def on_socket_response(self, res: dict, *, dedup: bool = True):
+        if self.recorder is not None:
+            self.recorder.record(res)
+
+        event_type = res["t"]
+        if event_type != "INTERACTION_CREATE":
+            if event_type in _DELETE_EVENTS:
+                self._on_delete(event_type, res["d"])
+            return
+        if res["d"]["type"] != 3:
+            return
+        # Resumes and overlapping shards can deliver the same interaction twice.
+        if dedup and await self.deduplicator.seen(res["d"]["id"]):
+            return
+        if self.analytics is not None:
+            self.analytics.click(res["d"])
+
+        with self.profiler.stage("on_socket_response"):
+            data = res["d"]["data"]
+            event = None
+            for key, value in InteractionEventType.items():
+                if value == data["component_type"]:
+                    event = key
+                    break
+
+            handler = self.router.resolve(event, data["custom_id"]) if event else None
+            if not self._check_cooldowns(res["d"], handler):
+                await self._acknowledge(res["d"])
+                return
+
+            with self.profiler.stage("_get_interaction"):
+                ctx = self._get_interaction(res)
+
+            with self.profiler.stage("dispatch"):
+                if event is not None:
+                    self.bot.dispatch(event, ctx)
+                if handler is not None:
+                    key = getattr(handler, "__component_serialized__", None)
+                    if key is not None:
+                        handler = self._serialized(handler, key)
+                    self.bot._schedule_event(handler, f"on_{event}", ctx)
+
+    def _serialized(self, handler, key):
+        async def run(ctx: Interaction):
+            lock_key = key(ctx) if callable(key) else bucket_key(key, ctx.raw_data["d"])
+            async with self.locks.hold(lock_key):
+                await handler(ctx)
+
+        return run
+
+    def _on_delete(self, event_type: str, data: dict):
+        if event_type == "MESSAGE_DELETE":
+            self.component_cache.pop(int(data["id"]))
+            self.evictions.message_deleted(data["id"])
+        elif event_type == "MESSAGE_DELETE_BULK":
+            for message_id in data["ids"]:
+                self.component_cache.pop(int(message_id))
+            self.evictions.messages_deleted(data["ids"])
+        elif event_type == "CHANNEL_DELETE":
+            self.evictions.channel_deleted(data["id"])
+        elif not data.get("unavailable"):
+            # An unavailable guild is an outage, not a removal, and comes back later.
+            self.evictions.guild_deleted(data["id"])
+
+    def _check_cooldowns(self, data: dict, handler=None) -> bool:
+        for cooldown in self.cooldowns:
+            if not self.cooldown_store.hit(cooldown, data):
+                return False
+        for cooldown in getattr(handler, "__component_cooldowns__", ()):
+            if not self.cooldown_store.hit(cooldown, data):
+                return False
+        return True
+
+    async def _request(
+        self, request_class: int, route: Route, *, deadline: float = None, **kwargs
+    ) -> Any:
+        return await self.scheduler.submit(
+            request_class, lambda: self.bot.http.request(route, **kwargs), deadline=deadline
+        )
+
+    async def _acknowledge(self, data: dict):
+        # Throttled clicks still need a callback, or the client shows "interaction failed".
+        await self._request(
+            RequestClass.callback,
+            Route("POST", f"/interactions/{data['id']}/{data['token']}/callback"),
+            json={"type": InteractionType.DeferredUpdateMessage},
+            deadline=monotonic() + INTERACTION_DEADLINE,
+        )
+
+    @Profiler.profiled("send_component_msg")
     async def send_component_msg(
         self,
         channel: Messageable,
@@ -88,23 +331,18 @@ class DiscordComponents:
         delete_after: float = None,
         **options,
     ) -> Message:
-        state = self.bot._get_state()
+        state = self.bot._connection
         channel = await channel._get_channel()
 
         if embed is not None:
             embed = embed.to_dict()
 
-        if allowed_mentions is not None:
-            if state.allowed_mentions:
-                allowed_mentions = state.allowed_mentions.merge(allowed_mentions).to_dict()
-            else:
-                allowed_mentions = allowed_mentions.to_dict()
-        else:
-            allowed_mentions = state.allowed_mentions and state.allowed_mentions.to_dict()
-
+        allowed_mentions = self._allowed_mentions(allowed_mentions, state)
         if mention_author is not None:
-            allowed_mentions = allowed_mentions or AllowedMentions().to_dict()
-            allowed_mentions["replied_user"] = bool(mention_author)
+            allowed_mentions = {
+                **(allowed_mentions or AllowedMentions().to_dict()),
+                "replied_user": bool(mention_author),
+            }
 
         if reference is not None:
             try:
@@ -114,18 +352,7 @@ class DiscordComponents:
                     "Reference parameter must be either Message or MessageReference."
                 ) from None
 
-        if files:
-            if file:
-                files.append(file)
-
-            if len(files) > 10:
-                raise InvalidArgument("files parameter must be a list of up to 10 elements")
-            elif not all(isinstance(file, File) for file in files):
-                raise InvalidArgument("files parameter must be a list of File")
-
-        elif file:
-            files = [file]
-
+        files = self._get_files(file, files)
         data = {
             "content": content,
             **self._get_components_json(components),
@@ -137,48 +364,69 @@ class DiscordComponents:
         }
 
         if files:
-            try:
-                form = FormData()
-                form.add_field(
-                    "payload_json", dumps(data, separators=(",", ":"), ensure_ascii=True)
-                )
-                for index, file in enumerate(files):
-                    form.add_field(
-                        f"file{index}",
-                        file.fp,
-                        filename=file.filename,
-                        content_type="application/octet-stream",
-                    )
-
-                data = await self.bot.http.request(
-                    Route("POST", f"/channels/{channel.id}/messages"), data=form, files=files
-                )
-
-            finally:
-                for f in files:
-                    f.close()
-
+            data = await self._upload(
+                RequestClass.send, Route("POST", f"/channels/{channel.id}/messages"), data, files
+            )
         else:
-            data = await self.bot.http.request(
-                Route("POST", f"/channels/{channel.id}/messages"), json=data
+            data = await self._request(
+                RequestClass.send, Route("POST", f"/channels/{channel.id}/messages"), json=data
             )
 
-        msg = ComponentMessage(components=components, state=state, channel=channel, data=data)
+        msg = ComponentMessage(
+            components=self._get_component_lines(components),
+            state=state,
+            channel=channel,
+            data=data,
+        )
         if delete_after is not None:
             self.bot.loop.create_task(msg.delete(delay=delete_after))
         return msg
 
+    def _get_files(self, file: File = None, files: List[File] = None) -> Optional[List[File]]:
+        if files:
+            files = [*files, file] if file else files
+            if len(files) > 10:
+                raise InvalidArgument("files parameter must be a list of up to 10 elements")
+            elif not all(isinstance(file, File) for file in files):
+                raise InvalidArgument("files parameter must be a list of File")
+            return files
+        return [file] if file else None
+
+    async def _upload(
+        self, request_class: int, route: Route, payload: dict, files: List[File], **kwargs
+    ) -> Any:
+        # The file objects are streamed into the request body, so buffers are never copied.
+        try:
+            form = FormData()
+            form.add_field("payload_json", dumps(payload, separators=(",", ":"), ensure_ascii=True))
+            for index, file in enumerate(files):
+                form.add_field(
+                    f"file{index}",
+                    file.fp,
+                    filename=file.filename,
+                    content_type="application/octet-stream",
+                )
+
+            return await self._request(request_class, route, data=form, files=files, **kwargs)
+        finally:
+            for file in files:
+                file.close()
+
+    @Profiler.profiled("edit_component_msg")
     async def edit_component_msg(
         self,
         message: Message,
         content: str = None,
         *,
         embed: Embed = None,
+        file: File = None,
+        files: List[File] = None,
         allowed_mentions: AllowedMentions = None,
         components: List[Union[Component, List[Component]]] = None,
         **options,
     ):
-        state = self.bot._get_state()
+        state = self.bot._connection
+        files = self._get_files(file, files)
         data = {**self._get_components_json(components), **options}
 
         if content is not None:
@@ -189,41 +437,85 @@ class DiscordComponents:
             data["embed"] = embed
 
         if allowed_mentions is not None:
-            if state.allowed_mentions:
-                allowed_mentions = state.allowed_mentions.merge(allowed_mentions).to_dict()
-            else:
-                allowed_mentions = allowed_mentions.to_dict()
-
-            data["allowed_mentions"] = allowed_mentions
+            data["allowed_mentions"] = self._allowed_mentions(allowed_mentions, state)
 
-        await self.bot.http.request(
-            Route("PATCH", f"/channels/{message.channel.id}/messages/{message.id}"), json=data
-        )
+        route = Route("PATCH", f"/channels/{message.channel.id}/messages/{message.id}")
+        if files:
+            await self._upload(RequestClass.edit, route, data, files)
+        else:
+            await self._request(RequestClass.edit, route, json=data)
+
+    def _allowed_mentions(
+        self, override: Optional[AllowedMentions] = None, state=None
+    ) -> Optional[dict]:
+        # The returned dicts are shared between requests and must not be mutated.
+        current = (state or self.bot._connection).allowed_mentions
+        if current is None and override is None:
+            return None
+
+        key = (_mentions_key(current), _mentions_key(override))
+        data = self.mentions_cache.get(key)
+        if data is None:
+            if override is None:
+                data = current.to_dict()
+            elif current is not None:
+                data = current.merge(override).to_dict()
+            else:
+                data = override.to_dict()
+            self.mentions_cache[key] = data
+        return data
 
     def _get_components_json(
-        self, components: List[Union[Component, List[Component]]] = None
+        self,
+        components: Union[
+            Layout,
+            ComponentGrid,
+            ActionRow,
+            List[Union[Component, ActionRow, ComponentGrid, List[Component]]],
+        ] = None,
+        validate: bool = None,
     ) -> dict:
-        if not isinstance(components, list) and not components:
+        if isinstance(components, Layout):
+            return {"components": components.to_dict()}
+        if isinstance(components, ComponentGrid):
+            return {"components": components.to_dict()}
+        if isinstance(components, ActionRow):
+            # A single row; iterating it would yield its components, one row each.
+            components = [components]
+        elif not isinstance(components, (list, tuple)) and not components:
             return {}
 
-        for i in range(len(components)):
-            if not isinstance(components[i], list):
-                components[i] = [components[i]]
-
-        lines = components
-        return {
-            "components": (
-                [
+        rows = []
+        for line in components:
+            if isinstance(line, (ActionRow, Layout, ComponentGrid)):
+                line = line.to_dict()
+                if isinstance(line, list):
+                    rows.extend(line)
+                else:
+                    rows.append(line)
+            elif isinstance(line, (list, tuple)):
+                rows.append(
                     {
                         "type": 1,
-                        "components": [component.to_dict() for component in components],
+                        "components": [component.to_dict() for component in line],
                     }
-                    for components in lines
-                ]
-                if lines
-                else []
-            ),
-        }
+                )
+            else:
+                rows.append({"type": 1, "components": [line.to_dict()]})
+
+        if self.validate if validate is None else validate:
+            validate_components(rows)
+        return {"components": rows}
+
+    def _get_component_lines(self, components):
+        if isinstance(components, ActionRow):
+            return [components]
+        if not isinstance(components, (list, tuple)):
+            return components
+        return [
+            line if isinstance(line, (list, tuple, ActionRow, ComponentGrid)) else [line]
+            for line in components
+        ]
 
     def _get_component_type(self, type: int):
         if type == 2:
@@ -231,6 +523,50 @@ class DiscordComponents:
         elif type == 3:
             return Select
 
+    def _parse_line(self, line: dict) -> Tuple[Component, ...]:
+        if line["type"] >= 2:
+            return (self._get_component_type(line["type"]).from_json(line),)
+        return tuple(
+            self._get_component_type(component["type"]).from_json(component)
+            for component in line["components"]
+            if component["type"] >= 2
+        )
+
+    def _parse_components(self, message: dict) -> List[List[Component]]:
+        # The caches hold parsed prototypes that are never handed out. Every caller gets
+        # its own clones, so a handler changing its components can't leak into other
+        # interactions or into other messages with the same layout.
+        return [
+            [component._clone() for component in line]
+            for line in self._parsed_components(message)
+        ]
+
+    def _parsed_components(self, message: dict) -> Tuple[Tuple[Component, ...], ...]:
+        message_id = int(message["id"])
+        edited = message.get("edited_timestamp")
+        cached = self.component_cache.get(message_id)
+        if cached is not None and cached[0] == edited:
+            tree = cached[1]
+        else:
+            lines = message.get("components", ())
+            if not self.layout_cache.maxsize:
+                tree = tuple(self._parse_line(line) for line in lines)
+            else:
+                digest = blake2b(_layout_encoder.encode(lines).encode(), digest_size=16).digest()
+                tree = self.layout_cache.get(digest)
+                if tree is None:
+                    tree = tuple(self._parse_line(line) for line in lines)
+                    self.layout_cache[digest] = tree
+            self.component_cache[message_id] = (edited, tree)
+        return tree
+
+    def cache_stats(self) -> dict:
+        return {
+            "messages": self.component_cache.stats(),
+            "layouts": self.layout_cache.stats(),
+            "allowed_mentions": self.mentions_cache.stats(),
+        }
+
     def _structured_raw_data(self, raw_data: dict) -> dict:
         data = {
             "interaction": raw_data["d"]["id"],
@@ -238,7 +574,7 @@ class DiscordComponents:
             "raw": raw_data,
         }
         raw_data = raw_data["d"]
-        state = self.bot._get_state()
+        state = self.bot._connection
 
         components = []
         if "components" not in raw_data["message"]:
@@ -247,14 +583,9 @@ class DiscordComponents:
             data["message"] = None
             data["user"] = None
         else:
-            for line in raw_data["message"]["components"]:
-                if line["type"] >= 2:
-                    components.append(self._get_component_type(line["type"]).from_json(line))
-                for component in line["components"]:
-                    if component["type"] >= 2:
-                        components.append(
-                            self._get_component_type(component["type"]).from_json(component)
-                        )
+            with self.profiler.stage("from_json"):
+                for line in self._parse_components(raw_data["message"]):
+                    components.extend(line)
 
             data["message"] = ComponentMessage(
                 state=state,
@@ -277,11 +608,14 @@ class DiscordComponents:
         rescomponent = []
 
         if data["message"]:
+            values = data["component"].get("values", [])
             for component in data["message"].components:
                 if isinstance(component, Select):
+                    if component.id != data["component"]["custom_id"]:
+                        continue
                     for option in component.options:
-                        if option.value in data["values"]:
-                            if len(data["values"]) > 1:
+                        if option.value in values:
+                            if len(values) > 1:
                                 rescomponent.append(option)
                             else:
                                 rescomponent = [option]
@@ -304,17 +638,12 @@ class DiscordComponents:
         return ctx
 
     async def fetch_component_message(self, message: Message) -> ComponentMessage:
-        res = await self.bot.http.request(
-            Route("GET", f"/channels/{message.channel.id}/messages/{message.id}")
+        res = await self._request(
+            RequestClass.fetch,
+            Route("GET", f"/channels/{message.channel.id}/messages/{message.id}"),
         )
-        components = []
-
-        for i in res["components"]:
-            components.append([])
-
-            for j in i["components"]:
-                components[-1].append(self._get_component_type(j["type"]).from_json(j))
+        components = self._parse_components(res)
 
         return ComponentMessage(
-            channel=message.channel, state=self.bot._get_state(), data=res, components=components
+            channel=message.channel, state=self.bot._connection, data=res, components=components
         )
@@ -1,9 +1,70 @@
+from sys import intern
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from discord import Emoji, PartialEmoji
+
+
 __all__ = ("Component",)
 
 
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Ids and labels repeat across every parse of the same message.
+    return intern(value) if value else value
+
+
+# discord (and aiohttp with it) is imported on first use rather than at import time, so
+# processes that only build and serialize components don't pay for it.
+
+
+def _invalid_argument(message: str) -> Exception:
+    from discord import InvalidArgument
+
+    return InvalidArgument(message)
+
+
+def _partial_emoji(emoji: Union["Emoji", "PartialEmoji", str, None]) -> Optional["PartialEmoji"]:
+    if emoji is None:
+        return None
+
+    from discord import Emoji, PartialEmoji
+
+    if isinstance(emoji, Emoji):
+        return PartialEmoji(name=emoji.name, animated=emoji.animated, id=emoji.id)
+    elif isinstance(emoji, PartialEmoji):
+        return emoji
+    elif isinstance(emoji, str):
+        return PartialEmoji(name=emoji)
+    return None
+
+
+def _emoji_from_json(data: Optional[dict]) -> Optional["PartialEmoji"]:
+    if not data:
+        return None
+
+    from discord import PartialEmoji
+
+    return PartialEmoji(name=data["name"], animated=data.get("animated", False), id=data.get("id"))
+
+
+def _new_id() -> str:
+    from uuid import uuid1
+
+    return str(uuid1())
+
+
+def _clone_emoji(emoji: Optional["PartialEmoji"]) -> Optional["PartialEmoji"]:
+    if emoji is None:
+        return None
+    return type(emoji)(name=emoji.name, animated=emoji.animated, id=emoji.id)
+
+
 class Component:
     def to_dict(self) -> dict:
         raise NotImplementedError()
 
+    def _clone(self) -> "Component":
+        raise NotImplementedError()
+
     def from_dict(self, data: dict):
         raise NotImplementedError()
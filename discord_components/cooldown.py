@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Hashable, List, Optional
+
+
+__all__ = ("BucketType", "Cooldown", "CooldownStore", "cooldown", "bucket_key")
+
+
+class BucketType:
+    user: int = 0
+    message: int = 1
+    guild: int = 2
+    channel: int = 3
+    custom_id: int = 4
+
+
+def _user_id(data: dict) -> Optional[str]:
+    user = data["member"]["user"] if "member" in data else data.get("user")
+    return user and user["id"]
+
+
+def bucket_key(bucket: int, data: dict) -> Hashable:
+    """The key of an interaction payload (``raw_data["d"]``) in a ``bucket``."""
+    if bucket == BucketType.user:
+        return _user_id(data)
+    if bucket == BucketType.message:
+        return (data.get("message") or {}).get("id")
+    if bucket == BucketType.guild:
+        return data.get("guild_id") or _user_id(data)
+    if bucket == BucketType.channel:
+        return data.get("channel_id")
+    return data["data"]["custom_id"]
+
+
+class Cooldown:
+    """A token bucket allowing ``rate`` interactions per ``per`` seconds for each bucket."""
+
+    __slots__ = ("rate", "per", "bucket")
+
+    def __init__(self, rate: int, per: float, bucket: int = BucketType.user):
+        self.rate = rate
+        self.per = per
+        self.bucket = bucket
+
+    def key(self, data: dict) -> Hashable:
+        return bucket_key(self.bucket, data)
+
+
+def cooldown(rate: int, per: float, bucket: int = BucketType.user):
+    """Throttles a routed handler (see :func:`on_click`) before it runs."""
+
+    def decorator(func):
+        func.__component_cooldowns__ = getattr(func, "__component_cooldowns__", ()) + (
+            Cooldown(rate, per, bucket),
+        )
+        return func
+
+    return decorator
+
+
+class CooldownStore:
+    """Token buckets for every live ``(cooldown, key)`` pair.
+
+    At most ``maxsize`` buckets are kept (least recently used go first), and
+    every ``sweep_interval`` seconds buckets that have refilled completely are
+    dropped, since a full bucket carries no state.
+    """
+
+    def __init__(self, *, maxsize: int = 100_000, sweep_interval: float = 60.0):
+        self.maxsize = maxsize
+        self.sweep_interval = sweep_interval
+
+        self._buckets: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._last_sweep = monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def hit(self, cooldown: Cooldown, data: dict) -> bool:
+        """Takes a token and returns ``True``, or returns ``False`` when throttled."""
+        now = monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        key = (id(cooldown), cooldown.key(data))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [cooldown.rate - 1, now, cooldown.per]
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return True
+
+        self._buckets.move_to_end(key)
+        tokens = min(cooldown.rate, bucket[0] + (now - bucket[1]) * cooldown.rate / cooldown.per)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            return False
+
+        bucket[0] = tokens - 1
+        return True
+
+    def sweep(self, now: float = None):
+        # Buckets refill lazily, so one left alone for "per" seconds is full and can go.
+        now = monotonic() if now is None else now
+        self._last_sweep = now
+        stale = [key for key, (_, last, per) in self._buckets.items() if now - last >= per]
+        for key in stale:
+            del self._buckets[key]
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional
+
+
+__all__ = ("DedupBackend", "MemoryDedupBackend", "Deduplicator")
+
+
+class DedupBackend:
+    """Storage for seen interaction ids.
+
+    ``add`` must atomically record ``key`` for ``ttl`` seconds and return
+    ``True`` only if it was not already recorded (``SET key 1 NX EX ttl`` in
+    Redis), so several shards or processes can share one backend.
+    """
+
+    async def add(self, key: str, ttl: float) -> bool:
+        raise NotImplementedError()
+
+
+class MemoryDedupBackend(DedupBackend):
+    __slots__ = ("maxsize", "_seen")
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add_now(self, key: str, ttl: float) -> bool:
+        now = monotonic()
+        expires = self._seen.get(key)
+        if expires is not None and expires > now:
+            return False
+
+        self._seen[key] = now + ttl
+        self._seen.move_to_end(key)
+        while self._seen:
+            oldest, oldest_expires = next(iter(self._seen.items()))
+            if len(self._seen) <= self.maxsize and oldest_expires > now:
+                break
+            del self._seen[oldest]
+        return True
+
+    async def add(self, key: str, ttl: float) -> bool:
+        return self.add_now(key, ttl)
+
+
+class Deduplicator:
+    """Drops interactions whose id was already seen within ``ttl`` seconds.
+
+    Ids are always checked against a bounded in-memory LRU first. A shared
+    ``backend`` is consulted only for ids that are new to this process.
+    """
+
+    def __init__(
+        self, *, maxsize: int = 10_000, ttl: float = 900, backend: Optional[DedupBackend] = None
+    ):
+        self.ttl = ttl
+        self.backend = backend
+        self.duplicates = 0
+
+        self._local = MemoryDedupBackend(maxsize)
+
+    async def seen(self, interaction_id: str) -> bool:
+        if not self._local.add_now(interaction_id, self.ttl) or (
+            self.backend is not None and not await self.backend.add(interaction_id, self.ttl)
+        ):
+            self.duplicates += 1
+            return True
+        return False
@@ -0,0 +1,102 @@
+from discord import Message
+
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+__all__ = ("EvictionIndex",)
+
+
+Callback = Callable[[int], None]
+
+
+class EvictionIndex:
+    """Tracks state tied to messages so it can be dropped when Discord deletes them.
+
+    State is registered per message with a callback taking the message id.
+    Messages are indexed by channel and channels by guild, so deleting a
+    message, a channel or a guild only touches the state it affects.
+    """
+
+    def __init__(self):
+        self._callbacks: Dict[int, List[Callback]] = {}
+        self._location: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+        self._channels: Dict[int, Set[int]] = {}
+        self._guilds: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._callbacks)
+
+    def __contains__(self, message_id: int) -> bool:
+        return int(message_id) in self._callbacks
+
+    def track(self, message: Message, callback: Callback):
+        channel_id = message.channel.id if message.channel is not None else None
+        guild_id = message.guild.id if message.guild is not None else None
+
+        callbacks = self._callbacks.get(message.id)
+        if callbacks is None:
+            self._callbacks[message.id] = [callback]
+            self._location[message.id] = (channel_id, guild_id)
+            if channel_id is not None:
+                self._channels.setdefault(channel_id, set()).add(message.id)
+            if guild_id is not None and channel_id is not None:
+                self._guilds.setdefault(guild_id, set()).add(channel_id)
+        elif callback not in callbacks:
+            callbacks.append(callback)
+
+    def untrack(self, message_id: int, callback: Callback = None):
+        message_id = int(message_id)
+        callbacks = self._callbacks.get(message_id)
+        if callbacks is None:
+            return
+
+        if callback is not None:
+            try:
+                callbacks.remove(callback)
+            except ValueError:
+                pass
+            if callbacks:
+                return
+        self._forget(message_id)
+
+    def _forget(self, message_id: int) -> List[Callback]:
+        callbacks = self._callbacks.pop(message_id, None)
+        if callbacks is None:
+            return []
+
+        channel_id, guild_id = self._location.pop(message_id)
+        messages = self._channels.get(channel_id)
+        if messages is not None:
+            messages.discard(message_id)
+            if not messages:
+                del self._channels[channel_id]
+                channels = self._guilds.get(guild_id)
+                if channels is not None:
+                    channels.discard(channel_id)
+                    if not channels:
+                        del self._guilds[guild_id]
+        return callbacks
+
+    def _evict(self, message_ids: Iterable[int]) -> int:
+        count = 0
+        for message_id in list(message_ids):
+            for callback in self._forget(message_id):
+                callback(message_id)
+            count += 1
+        return count
+
+    def message_deleted(self, message_id: int) -> int:
+        message_id = int(message_id)
+        return self._evict((message_id,) if message_id in self._callbacks else ())
+
+    def messages_deleted(self, message_ids: Iterable[int]) -> int:
+        return self._evict(
+            message_id for message_id in map(int, message_ids) if message_id in self._callbacks
+        )
+
+    def channel_deleted(self, channel_id: int) -> int:
+        return self._evict(self._channels.get(int(channel_id), ()))
+
+    def guild_deleted(self, guild_id: int) -> int:
+        channels = self._guilds.get(int(guild_id), ())
+        return sum(self.channel_deleted(channel_id) for channel_id in list(channels))
@@ -0,0 +1,182 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .button import Button
+from .component import _invalid_argument
+from .layout import _thaw_row
+from .validation import validate_components
+
+
+__all__ = ("ComponentGrid",)
+
+
+class ComponentGrid:
+    """A board of buttons whose cells hold a small integer state.
+
+    Every state is drawn with a template ``Button`` (its id is ignored). Cell
+    states live in a byte array, custom ids map back to cells through a dict,
+    and serialized cells and rows are cached so that ``to_dict`` only rebuilds
+    the rows that changed since the previous render.
+    """
+
+    __slots__ = (
+        "_rows",
+        "_cols",
+        "_prefix",
+        "_templates",
+        "_disabled",
+        "_cells",
+        "_counts",
+        "_ids",
+        "_index",
+        "_cell_cache",
+        "_row_cache",
+    )
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        *,
+        states: List[Button],
+        prefix: str = "grid",
+        default: int = 0,
+    ):
+        if not (1 <= rows <= 5) or not (1 <= cols <= 5):
+            raise _invalid_argument("A grid can have at most 5 rows and 5 columns.")
+        if not (1 <= len(states) <= 256):
+            raise _invalid_argument("A grid needs between 1 and 256 states.")
+        if not (0 <= default < len(states)):
+            raise _invalid_argument(f"default must be between 0 and {len(states) - 1}.")
+
+        self._rows = rows
+        self._cols = cols
+        self._prefix = prefix
+        self._disabled = False
+        self._templates = []
+        for template in states:
+            data = template.to_dict()
+            data.pop("custom_id", None)
+            data.pop("url", None)
+            self._templates.append(data)
+
+        self._ids = [f"{prefix}:{row}:{col}" for row in range(rows) for col in range(cols)]
+        self._index: Dict[str, int] = {custom_id: i for i, custom_id in enumerate(self._ids)}
+
+        self._cells = array("B", [default]) * (rows * cols)
+        self._counts = [0] * len(states)
+        self._counts[default] = rows * cols
+        self._cell_cache: List[Optional[dict]] = [None] * (rows * cols)
+        self._row_cache: List[Optional[dict]] = [None] * rows
+
+        validate_components(self.to_dict())
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        return self._cols
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    @property
+    def cells(self) -> memoryview:
+        # Read-only, since writes must go through set() to keep counts and caches right.
+        return memoryview(self._cells).toreadonly()
+
+    @property
+    def disabled(self) -> bool:
+        return self._disabled
+
+    @disabled.setter
+    def disabled(self, value: bool):
+        if value != self._disabled:
+            self._disabled = value
+            self._cell_cache = [None] * len(self._cells)
+            self._row_cache = [None] * self._rows
+
+    def _index_of(self, row: int, col: int) -> int:
+        if not (0 <= row < self._rows) or not (0 <= col < self._cols):
+            raise _invalid_argument(
+                f"Cell ({row}, {col}) is outside the {self._rows}x{self._cols} grid."
+            )
+        return row * self._cols + col
+
+    def __getitem__(self, position: Tuple[int, int]) -> int:
+        return self._cells[self._index_of(*position)]
+
+    def __setitem__(self, position: Tuple[int, int], state: int):
+        self.set(*position, state)
+
+    def set(self, row: int, col: int, state: int):
+        index = self._index_of(row, col)
+        if not (0 <= state < len(self._templates)):
+            raise _invalid_argument(f"state must be between 0 and {len(self._templates) - 1}.")
+
+        previous = self._cells[index]
+        if previous == state:
+            return
+
+        self._counts[state] += 1
+        self._counts[previous] -= 1
+        self._cells[index] = state
+        self._cell_cache[index] = None
+        self._row_cache[row] = None
+
+    def fill(self, state: int):
+        for row in range(self._rows):
+            for col in range(self._cols):
+                self.set(row, col, state)
+
+    def count(self, state: int) -> int:
+        return self._counts[state]
+
+    def locate(self, custom_id: str) -> Optional[Tuple[int, int]]:
+        index = self._index.get(custom_id)
+        if index is None:
+            return None
+        return divmod(index, self._cols)
+
+    def custom_id(self, row: int, col: int) -> str:
+        return self._ids[self._index_of(row, col)]
+
+    def row(self, row: int) -> Tuple[int, ...]:
+        start = self._index_of(row, 0)
+        return tuple(self._cells[start : start + self._cols])
+
+    def column(self, col: int) -> Tuple[int, ...]:
+        return tuple(self._cells[self._index_of(0, col) :: self._cols])
+
+    def diagonals(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        size = min(self._rows, self._cols)
+        return (
+            tuple(self[i, i] for i in range(size)),
+            tuple(self[i, self._cols - 1 - i] for i in range(size)),
+        )
+
+    def _cell_dict(self, index: int) -> dict:
+        data = self._cell_cache[index]
+        if data is None:
+            data = {**self._templates[self._cells[index]], "custom_id": self._ids[index]}
+            if self._disabled:
+                data["disabled"] = True
+            self._cell_cache[index] = data
+        return data
+
+    def to_dict(self) -> List[dict]:
+        rows = self._row_cache
+        for row in range(self._rows):
+            if rows[row] is None:
+                start = row * self._cols
+                rows[row] = {
+                    "type": 1,
+                    "components": [
+                        self._cell_dict(index) for index in range(start, start + self._cols)
+                    ],
+                }
+        # The cached rows are reused by later renders, so callers get copies.
+        return [_thaw_row(row) for row in rows]
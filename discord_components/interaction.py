@@ -1,14 +1,17 @@
-from discord import User, Client, Embed, AllowedMentions, InvalidArgument, Message
-from discord.ext.commands import Bot
+from discord import User, Client, Embed, AllowedMentions, InvalidArgument, Message, File
 from discord.http import Route
 
-from aiohttp import FormData
-from typing import List, Union
-from json import dumps
+from typing import TYPE_CHECKING, List, Union
+from time import monotonic
 
 from .button import Button
 from .message import ComponentMessage
 from .component import Component
+from .profiler import Profiler
+from .scheduler import RequestClass
+
+if TYPE_CHECKING:
+    from discord.ext.commands import Bot
 
 
 __all__ = ("Interaction", "InteractionType", "InteractionEventType", "FlagsType")
@@ -16,6 +19,9 @@ __all__ = ("Interaction", "InteractionType", "InteractionEventType", "FlagsType"
 
 InteractionEventType = {"button_click": 2, "select_option": 3}
 
+# Seconds Discord waits for the initial callback before failing the interaction.
+INTERACTION_DEADLINE = 3.0
+
 
 class InteractionType:
     Pong: int = 1
@@ -39,7 +45,7 @@ class Interaction:
     def __init__(
         self,
         *,
-        bot: Union[Client, Bot],
+        bot: Union[Client, "Bot"],
         client: "DiscordComponents",
         user: User = None,
         component: Component,
@@ -64,7 +70,10 @@ class Interaction:
 
         self.interaction_id = raw_data["d"]["id"]
         self.interaction_token = raw_data["d"]["token"]
+        self.received_at = monotonic()
+        self.deadline = self.received_at + INTERACTION_DEADLINE
 
+    @Profiler.profiled("respond", lambda self: self.client.profiler)
     async def respond(
         self,
         *,
@@ -75,10 +84,12 @@ class Interaction:
         allowed_mentions: AllowedMentions = None,
         tts: bool = False,
         ephemeral: bool = True,
+        file: File = None,
+        files: List[File] = None,
         components: List[Union[Component, List[Component]]] = None,
         **options,
     ) -> None:
-        state = self.bot._get_state()
+        files = self.client._get_files(file, files)
         data = {
             **self.client._get_components_json(components),
             **options,
@@ -88,30 +99,53 @@ class Interaction:
         if content is not None:
             data["content"] = content
 
-        if embed and embeds:
-            embeds.append(embed)
-        elif embed:
+        if embed is not None and embeds:
+            embeds = [*embeds, embed]
+        elif embed is not None:
             embeds = [embed]
 
         if embeds:
-            embeds = list(map(lambda x: x.to_dict(), embeds))
             if len(embeds) > 10:
                 raise InvalidArgument("Embed limit exceeded. (Max: 10)")
-            data["embeds"] = embeds
-
-        if allowed_mentions:
-            if state.allowed_mentions:
-                allowed_mentions = state.allowed_mentions.merge(allowed_mentions).to_dict()
-            else:
-                allowed_mentions = allowed_mentions.to_dict()
+            data["embeds"] = [embed.to_dict() for embed in embeds]
 
-            data["allowed_mentions"] = allowed_mentions
+        if allowed_mentions is not None:
+            data["allowed_mentions"] = self.client._allowed_mentions(allowed_mentions)
 
         if tts is not None:
             data["tts"] = tts
 
+        await self._callback(type, data, files)
+
+    async def _callback(self, type: int, data: dict, files: List[File] = None) -> None:
+        # Checked and set with no await in between, so concurrent handlers of one
+        # interaction can never both reach the network.
+        if self.responded:
+            raise InvalidArgument("This interaction has already been responded to.")
+
         self.responded = True
-        await self.bot.http.request(
-            Route("POST", f"/interactions/{self.interaction_id}/{self.interaction_token}/callback"),
-            json={"type": type, "data": data},
-        )
+        try:
+            route = Route(
+                "POST", f"/interactions/{self.interaction_id}/{self.interaction_token}/callback"
+            )
+            if files:
+                await self.client._upload(
+                    RequestClass.callback,
+                    route,
+                    {"type": type, "data": data},
+                    files,
+                    deadline=self.deadline,
+                )
+            else:
+                await self.client._request(
+                    RequestClass.callback,
+                    route,
+                    json={"type": type, "data": data},
+                    deadline=self.deadline,
+                )
+        except Exception:
+            self.responded = False
+            raise
+
+        if self.client.analytics is not None:
+            self.client.analytics.response(self.raw_data["d"], monotonic() - self.received_at)
@@ -0,0 +1,140 @@
+from json import dumps
+from typing import Iterator, List, Tuple, Union
+
+from .component import Component, _invalid_argument
+from .validation import validate_components
+
+
+__all__ = ("ActionRow", "Layout")
+
+
+def _freeze(payload) -> str:
+    return dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _thaw_component(data: dict) -> dict:
+    data = dict(data)
+    emoji = data.get("emoji")
+    if emoji is not None:
+        data["emoji"] = dict(emoji)
+    options = data.get("options")
+    if options is not None:
+        data["options"] = [_thaw_component(option) for option in options]
+    return data
+
+
+def _thaw_row(row: dict) -> dict:
+    # The stored payload is never handed out, so it (and the key) can't go stale.
+    return {"type": 1, "components": [_thaw_component(data) for data in row["components"]]}
+
+
+class ActionRow:
+    """An immutable row of components.
+
+    The row is serialized once at construction, so later changes to the
+    component objects are not reflected in it. :meth:`to_dict` returns a new
+    copy of that payload on every call.
+    """
+
+    __slots__ = ("_components", "_payload", "_key")
+
+    def __init__(self, *components: Component):
+        if len(components) == 1 and isinstance(components[0], (list, tuple)):
+            components = tuple(components[0])
+        if not all(isinstance(component, Component) for component in components):
+            raise _invalid_argument("An action row can only contain components.")
+
+        self._components: Tuple[Component, ...] = components
+        self._payload = {
+            "type": 1,
+            "components": [component.to_dict() for component in components],
+        }
+        self._key = _freeze(self._payload)
+
+    @property
+    def components(self) -> Tuple[Component, ...]:
+        return self._components
+
+    def to_dict(self) -> dict:
+        return _thaw_row(self._payload)
+
+    def __iter__(self) -> Iterator[Component]:
+        return iter(self._components)
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def __getitem__(self, index: int) -> Component:
+        return self._components[index]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ActionRow) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __repr__(self) -> str:
+        return f"<ActionRow components={self._components!r}>"
+
+
+def _as_row(row) -> ActionRow:
+    if isinstance(row, ActionRow):
+        return row
+    if isinstance(row, (list, tuple)):
+        return ActionRow(*row)
+    return ActionRow(row)
+
+
+class Layout:
+    """An immutable, hashable set of action rows.
+
+    Rows are normalized, serialized and validated once at construction. A
+    layout can be shared between coroutines and sent any number of times, and
+    equal layouts hash equally, so a layout can key caches of serialized
+    payloads. Sending a layout skips the per-send validation, and
+    :meth:`to_dict` returns a new copy of the payload on every call.
+    """
+
+    __slots__ = ("_rows", "_payload", "_key", "_hash")
+
+    def __init__(
+        self,
+        *rows: Union[ActionRow, Component, List[Component], Tuple[Component, ...]],
+        validate: bool = True,
+    ):
+        self._rows: Tuple[ActionRow, ...] = tuple(_as_row(row) for row in rows)
+        self._payload: Tuple[dict, ...] = tuple(row._payload for row in self._rows)
+        if validate:
+            validate_components(self._payload)
+
+        self._key = _freeze(self._payload)
+        self._hash = hash(self._key)
+
+    @property
+    def rows(self) -> Tuple[ActionRow, ...]:
+        return self._rows
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    def to_dict(self) -> List[dict]:
+        return [_thaw_row(row) for row in self._payload]
+
+    def __iter__(self) -> Iterator[ActionRow]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> ActionRow:
+        return self._rows[index]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Layout) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"<Layout rows={self._rows!r}>"
@@ -0,0 +1,92 @@
+from asyncio import Lock, Semaphore
+
+from typing import Callable, Dict, Hashable, Union
+
+from .cooldown import BucketType
+
+
+__all__ = ("LockPool", "serialized")
+
+
+def serialized(key: Union[int, Callable[["Interaction"], Hashable]] = BucketType.message):
+    """Runs a routed handler (see :func:`on_click`) for one interaction at a time per key.
+
+    ``key`` is a :class:`BucketType` or a callable taking the interaction.
+    Interactions sharing a key are handled in the order they arrived, and
+    different keys still run concurrently.
+    """
+
+    def decorator(func):
+        func.__component_serialized__ = key
+        return func
+
+    return decorator
+
+
+class _Entry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = Lock()
+        self.users = 0
+
+
+class _Hold:
+    __slots__ = ("pool", "key", "entry")
+
+    def __init__(self, pool: "LockPool", key: Hashable):
+        self.pool = pool
+        self.key = key
+        self.entry = None
+
+    async def __aenter__(self):
+        self.entry = await self.pool._join(self.key)
+        try:
+            await self.entry.lock.acquire()
+        except BaseException:
+            self.pool._leave(self.key, self.entry)
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self.entry.lock.release()
+        self.pool._leave(self.key, self.entry)
+
+
+class LockPool:
+    """FIFO locks created on demand per key and dropped once nobody holds or waits on them.
+
+    At most ``maxsize`` keys are live at once; interactions for further keys
+    wait until one is released, so memory is bounded by concurrent keys, not
+    by every message ever seen.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._slots = Semaphore(maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hold(self, key: Hashable) -> _Hold:
+        return _Hold(self, key)
+
+    async def _join(self, key: Hashable) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            await self._slots.acquire()
+            # Another interaction for the same key may have created it meanwhile.
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            else:
+                self._slots.release()
+        entry.users += 1
+        return entry
+
+    def _leave(self, key: Hashable, entry: _Entry):
+        entry.users -= 1
+        if not entry.users and self._entries.get(key) is entry:
+            del self._entries[key]
+            self._slots.release()
@@ -8,3 +8,5 @@ class ComponentMessage(Message):
     def __init__(self, *, components: List[Union[Component, List[Component]]] = [], **kwargs):
         super().__init__(**kwargs)
         self.components = components
+        # Row layout as Discord sent it; `components` is flat for interaction messages.
+        self._component_rows: List[dict] = kwargs["data"].get("components") or []
@@ -0,0 +1,265 @@
+from discord.http import Route
+
+from aiohttp import web
+from asyncio import sleep
+from contextlib import contextmanager
+from itertools import count
+from json import dumps, loads
+from time import monotonic, time
+from typing import Dict, List, Optional, Tuple
+
+
+__all__ = ("MockDiscordServer",)
+
+
+def _json_response(data, *, status: int = 200, headers: dict = None) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly "application/json".
+    return web.Response(
+        body=dumps(data).encode("utf-8"),
+        status=status,
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+
+
+class _Bucket:
+    __slots__ = ("name", "remaining", "reset_at")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.remaining = 0
+        self.reset_at = 0.0
+
+
+class MockDiscordServer:
+    """A local stand-in for the parts of the Discord HTTP API this library uses.
+
+    It serves message create/edit/get/delete, interaction callbacks and
+    ``/users/@me`` (for ``Client.login``) under the same paths as
+    ``discord.http.Route.BASE``. Every route has a per-channel (or
+    per-interaction) bucket of ``rate_limit`` requests per ``per`` seconds plus a
+    global limit, answered with Discord's rate limit headers and 429 bodies so
+    discord.py's own throttling is exercised.
+
+    Use :meth:`patch_route` to point discord.py at the server while it runs.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limit: int = 5,
+        per: float = 5.0,
+        global_rate_limit: int = 50,
+        latency: float = 0.0,
+    ):
+        self.host = host
+        self.port = port
+        self.rate_limit = rate_limit
+        self.per = per
+        self.global_rate_limit = global_rate_limit
+        self.latency = latency
+
+        self.messages: Dict[int, dict] = {}
+        self.callbacks: List[Tuple[int, dict]] = []
+        self.requests = 0
+        self.rate_limited = 0
+
+        self._ids = count(800000000000000000)
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global: List[float] = [0, 0.0]
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/v7"
+
+    async def start(self):
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/v7/users/@me", self._me)
+        app.router.add_post("/api/v7/channels/{channel_id}/messages", self._create_message)
+        app.router.add_get("/api/v7/channels/{channel_id}/messages/{message_id}", self._get_message)
+        app.router.add_patch(
+            "/api/v7/channels/{channel_id}/messages/{message_id}", self._edit_message
+        )
+        app.router.add_delete(
+            "/api/v7/channels/{channel_id}/messages/{message_id}", self._delete_message
+        )
+        app.router.add_post(
+            "/api/v7/interactions/{interaction_id}/{token}/callback", self._callback
+        )
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockDiscordServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @contextmanager
+    def patch_route(self):
+        base = Route.BASE
+        Route.BASE = self.base_url
+        try:
+            yield self
+        finally:
+            Route.BASE = base
+
+    def _bucket_name(self, request: web.Request) -> str:
+        info = request.match_info
+        major = info.get("channel_id") or info.get("interaction_id") or ""
+        return f"{request.method} {request.match_info.route.resource.canonical}:{major}"
+
+    def _rate_limited(self, retry_after: float, bucket: str, is_global: bool) -> web.Response:
+        self.rate_limited += 1
+        headers = {"Via": "1.1 mock", "Retry-After": str(max(1, round(retry_after)))}
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        else:
+            headers.update(
+                {
+                    "X-RateLimit-Limit": str(self.rate_limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset-After": f"{retry_after:.3f}",
+                    "X-RateLimit-Bucket": bucket,
+                }
+            )
+        return _json_response(
+            {
+                "message": "You are being rate limited.",
+                "retry_after": retry_after * 1000,
+                "global": is_global,
+            },
+            status=429,
+            headers=headers,
+        )
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests += 1
+        now = monotonic()
+
+        if now >= self._global[1]:
+            self._global = [self.global_rate_limit, now + 1.0]
+        if self._global[0] <= 0:
+            return self._rate_limited(self._global[1] - now, "global", True)
+        self._global[0] -= 1
+
+        name = self._bucket_name(request)
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = _Bucket(f"{abs(hash(name)):x}")
+        if now >= bucket.reset_at:
+            bucket.remaining = self.rate_limit
+            bucket.reset_at = now + self.per
+        if bucket.remaining <= 0:
+            return self._rate_limited(bucket.reset_at - now, bucket.name, False)
+        bucket.remaining -= 1
+
+        if self.latency:
+            await sleep(self.latency)
+
+        response = await handler(request)
+        reset_after = bucket.reset_at - now
+        response.headers.update(
+            {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(bucket.remaining),
+                "X-RateLimit-Reset": f"{time() + reset_after:.3f}",
+                "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+                "X-RateLimit-Bucket": bucket.name,
+            }
+        )
+        return response
+
+    def _user(self) -> dict:
+        return {
+            "id": "1",
+            "username": "mock",
+            "discriminator": "0000",
+            "avatar": None,
+            "bot": True,
+        }
+
+    async def _me(self, request: web.Request) -> web.Response:
+        return _json_response(self._user())
+
+    async def _payload(self, request: web.Request) -> dict:
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            return loads(form.get("payload_json", "{}"))
+        if request.can_read_body:
+            return await request.json()
+        return {}
+
+    async def _create_message(self, request: web.Request) -> web.Response:
+        data = await self._payload(request)
+        message = {
+            "id": str(next(self._ids)),
+            "channel_id": request.match_info["channel_id"],
+            "author": self._user(),
+            "content": data.get("content") or "",
+            "timestamp": "1970-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": bool(data.get("tts")),
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [data["embed"]] if data.get("embed") else [],
+            "pinned": False,
+            "type": 0 if data.get("message_reference") is None else 19,
+            "components": data.get("components") or [],
+        }
+        self.messages[int(message["id"])] = message
+        return _json_response(message)
+
+    def _find(self, request: web.Request) -> Optional[dict]:
+        message = self.messages.get(int(request.match_info["message_id"]))
+        if message is None or message["channel_id"] != request.match_info["channel_id"]:
+            return None
+        return message
+
+    def _not_found(self) -> web.Response:
+        return _json_response({"message": "Unknown Message", "code": 10008}, status=404)
+
+    async def _get_message(self, request: web.Request) -> web.Response:
+        message = self._find(request)
+        return self._not_found() if message is None else _json_response(message)
+
+    async def _edit_message(self, request: web.Request) -> web.Response:
+        message = self._find(request)
+        if message is None:
+            return self._not_found()
+
+        data = await self._payload(request)
+        for key in ("content", "components"):
+            if key in data:
+                message[key] = data[key]
+        if "embed" in data:
+            message["embeds"] = [data["embed"]] if data["embed"] else []
+        message["edited_timestamp"] = "1970-01-01T00:00:01+00:00"
+        return _json_response(message)
+
+    async def _delete_message(self, request: web.Request) -> web.Response:
+        if self._find(request) is None:
+            return self._not_found()
+        del self.messages[int(request.match_info["message_id"])]
+        return web.Response(status=204)
+
+    async def _callback(self, request: web.Request) -> web.Response:
+        self.callbacks.append(
+            (int(request.match_info["interaction_id"]), await self._payload(request))
+        )
+        return web.Response(status=204)
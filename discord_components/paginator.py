@@ -0,0 +1,233 @@
+from discord import Embed, Message
+from discord.abc import Messageable
+
+from asyncio import CancelledError, Task, TimeoutError, ensure_future, shield
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from .button import Button, ButtonStyle
+from .interaction import Interaction, InteractionType
+
+
+__all__ = ("Paginator",)
+
+
+class _IteratorSource:
+    __slots__ = ("_iterator", "_pages", "_exhausted")
+
+    def __init__(self, iterator: AsyncIterator):
+        self._iterator = iterator
+        self._pages = []
+        self._exhausted = False
+
+    async def __call__(self, index: int):
+        while len(self._pages) <= index and not self._exhausted:
+            try:
+                self._pages.append(await self._iterator.__anext__())
+            except StopAsyncIteration:
+                self._exhausted = True
+        return self._pages[index] if index < len(self._pages) else None
+
+
+def _default_render(page: Any) -> dict:
+    if isinstance(page, Embed):
+        return {"embed": page}
+    if isinstance(page, dict):
+        return page
+    return {"content": str(page)}
+
+
+class Paginator:
+    """Pages through a lazily fetched source with previous/next buttons.
+
+    ``source`` is either ``async def source(index)`` returning a page (``None``
+    past the end) or an async iterator of pages. Rendered pages are kept in an
+    LRU window of ``cache_size`` entries and the page after the current one is
+    fetched in the background. Pages pulled from an async iterator stay buffered
+    because an iterator cannot be rewound; use a callable for random access.
+    """
+
+    def __init__(
+        self,
+        client: "DiscordComponents",
+        source: Union[Callable[[int], Awaitable[Any]], AsyncIterator],
+        *,
+        render: Callable[[Any], dict] = _default_render,
+        page_count: int = None,
+        cache_size: int = 8,
+        prefetch: bool = True,
+        prefix: str = "paginator",
+    ):
+        self.client = client
+        self.source = source if callable(source) else _IteratorSource(source)
+        self.render = render
+        self.page_count = page_count
+        self.cache_size = cache_size
+        self.prefetch = prefetch
+        self.prefix = prefix
+
+        self.index = 0
+        self.message: Optional[Message] = None
+
+        self._pages: "OrderedDict[int, dict]" = OrderedDict()
+        self._pending: Dict[int, Task] = {}
+        self._waiter: Optional[Task] = None
+
+    @property
+    def previous_id(self) -> str:
+        return f"{self.prefix}:previous"
+
+    @property
+    def next_id(self) -> str:
+        return f"{self.prefix}:next"
+
+    def _components(self, index: int, disabled: bool = False) -> List[Button]:
+        last = self.page_count - 1 if self.page_count is not None else None
+        return [
+            Button(
+                style=ButtonStyle.gray,
+                label="◀",
+                id=self.previous_id,
+                disabled=disabled or index == 0,
+            ),
+            Button(
+                style=ButtonStyle.gray,
+                label=f"{index + 1}" if last is None else f"{index + 1}/{last + 1}",
+                id=f"{self.prefix}:page",
+                disabled=True,
+            ),
+            Button(
+                style=ButtonStyle.gray,
+                label="▶",
+                id=self.next_id,
+                disabled=disabled or index == last,
+            ),
+        ]
+
+    async def _load(self, index: int) -> Optional[dict]:
+        page = await self.source(index)
+        if page is None:
+            if self.page_count is None or self.page_count > index:
+                self.page_count = index
+                self._pages.pop(index - 1, None)
+            return None
+
+        rendered = {**self.render(page), "components": [self._components(index)]}
+        self._pages[index] = rendered
+        while len(self._pages) > self.cache_size:
+            self._pages.popitem(last=False)
+        return rendered
+
+    async def get_page(self, index: int) -> Optional[dict]:
+        if index < 0 or (self.page_count is not None and index >= self.page_count):
+            return None
+
+        rendered = self._pages.get(index)
+        if rendered is not None:
+            self._pages.move_to_end(index)
+            return rendered
+
+        task = self._pending.get(index)
+        if task is None:
+            task = self.client.bot.loop.create_task(self._load(index))
+            self._pending[index] = task
+            task.add_done_callback(lambda _: self._pending.pop(index, None))
+        return await shield(task)
+
+    def _prefetch(self, index: int):
+        if not self.prefetch or index in self._pages or index in self._pending:
+            return
+        if self.page_count is not None and index >= self.page_count:
+            return
+
+        task = self.client.bot.loop.create_task(self._load(index))
+        self._pending[index] = task
+        task.add_done_callback(lambda _: self._pending.pop(index, None))
+
+    async def send(self, channel: Messageable, **kwargs) -> Message:
+        rendered = await self.get_page(self.index)
+        if rendered is None:
+            raise ValueError("The source has no pages.")
+
+        self.message = await self.client.send_component_msg(channel, **rendered, **kwargs)
+        self.client.evictions.track(self.message, self._deleted)
+        self._prefetch(self.index + 1)
+        return self.message
+
+    def close(self):
+        """Stops tracking the message and drops the page cache.
+
+        :meth:`run` calls this when it returns; call it yourself when driving
+        the paginator through :meth:`send` and :meth:`handle`.
+        """
+        if self.message is not None:
+            self.client.evictions.untrack(self.message.id, self._deleted)
+        self._pages.clear()
+        for task in list(self._pending.values()):
+            task.cancel()
+
+    def _deleted(self, message_id: int):
+        self.message = None
+        self._pages.clear()
+        if self._waiter is not None:
+            self._waiter.cancel()
+
+    async def handle(self, interaction: Interaction) -> bool:
+        custom_id = interaction.raw_data["d"]["data"]["custom_id"]
+        if custom_id == self.previous_id:
+            index = self.index - 1
+        elif custom_id == self.next_id:
+            index = self.index + 1
+        else:
+            return False
+
+        rendered = await self.get_page(index)
+        if rendered is None:
+            # Walked past the end of a source of unknown length; redraw without "next".
+            index = self.index
+            rendered = await self.get_page(index)
+
+        self.index = index
+        await interaction.respond(type=InteractionType.UpdateMessage, ephemeral=False, **rendered)
+        self._prefetch(index + 1)
+        return True
+
+    async def run(
+        self,
+        channel: Messageable,
+        *,
+        timeout: float = 60,
+        check: Callable[[Interaction], bool] = None,
+        **kwargs,
+    ) -> Message:
+        message = await self.send(channel, **kwargs)
+
+        def _check(interaction: Interaction) -> bool:
+            return (
+                interaction.message is not None
+                and interaction.message.id == message.id
+                and (check is None or check(interaction))
+            )
+
+        try:
+            while True:
+                self._waiter = ensure_future(
+                    self.client.bot.wait_for("button_click", check=_check, timeout=timeout)
+                )
+                try:
+                    interaction = await self._waiter
+                except CancelledError:
+                    if self.message is None:
+                        return message
+                    raise
+                except TimeoutError:
+                    await self.client.edit_component_msg(
+                        message, components=[self._components(self.index, disabled=True)]
+                    )
+                    return message
+                finally:
+                    self._waiter = None
+
+                await self.handle(interaction)
+        finally:
+            self.close()
@@ -0,0 +1,216 @@
+from discord import InvalidArgument, Message, NotFound
+from discord.abc import Messageable
+
+from asyncio import sleep
+from time import monotonic
+from typing import Dict, List, Optional, Union
+import logging
+
+from .button import Button, ButtonStyle
+from .component import _new_id
+from .interaction import Interaction
+from .select import Option, Select
+from .template import ResponseTemplate
+
+
+__all__ = ("Poll",)
+
+
+log = logging.getLogger(__name__)
+
+
+class Poll:
+    """A vote with one button per option, or a single select with ``select=True``.
+
+    Votes are counted in memory with one vote per user; with ``allow_change``
+    a new click moves the user's vote. Each click gets an ephemeral reply
+    straight away, while the public message showing the totals is edited at
+    most once every ``render_interval`` seconds, with the latest totals.
+    The custom ids start with ``prefix``, which is unique per poll by default.
+    """
+
+    def __init__(
+        self,
+        client: "DiscordComponents",
+        question: str,
+        options: List[str],
+        *,
+        prefix: str = None,
+        select: bool = False,
+        allow_change: bool = True,
+        render_interval: float = 5.0,
+    ):
+        if not 2 <= len(options) <= 25:
+            raise InvalidArgument("A poll needs between 2 and 25 options.")
+
+        self.client = client
+        self.question = question
+        self.options = list(options)
+        self.prefix = prefix or f"poll:{_new_id()}"
+        self.select = select
+        self.allow_change = allow_change
+        self.render_interval = render_interval
+
+        self.message: Optional[Message] = None
+        self.closed = False
+
+        self._counts = [0] * len(options)
+        self._votes: Dict[int, int] = {}
+        self._dirty = False
+        self._rendered_at = 0.0
+        self._render_task = None
+        self._replies = [
+            ResponseTemplate(f"You voted for **{option}**.") for option in self.options
+        ]
+        self._already_voted = ResponseTemplate("You have already voted.")
+        self._poll_closed = ResponseTemplate("This poll is closed.")
+
+    @property
+    def total(self) -> int:
+        return len(self._votes)
+
+    def results(self) -> Dict[str, int]:
+        return dict(zip(self.options, self._counts))
+
+    def _content(self) -> str:
+        return f"{self.question}\n{self.total} vote{'' if self.total == 1 else 's'}"
+
+    def _components(self) -> List[List[Union[Button, Select]]]:
+        disabled = self.closed
+        if self.select:
+            return [
+                [
+                    Select(
+                        id=self.prefix,
+                        placeholder="Poll closed" if disabled else "Vote",
+                        options=[
+                            Option(label=option, value=str(index), description=f"{count} votes")
+                            for index, (option, count) in enumerate(zip(self.options, self._counts))
+                        ],
+                    )
+                ]
+            ]
+
+        buttons = [
+            Button(
+                style=ButtonStyle.gray,
+                label=f"{option} ({count})",
+                id=f"{self.prefix}:{index}",
+                disabled=disabled,
+            )
+            for index, (option, count) in enumerate(zip(self.options, self._counts))
+        ]
+        return [buttons[start : start + 5] for start in range(0, len(buttons), 5)]
+
+    async def send(self, channel: Messageable, **kwargs) -> Message:
+        # Routed before sending, so a clashing prefix fails before anything is posted.
+        if self.select:
+            self.client.router.add("select_option", self.prefix, self.handle, owner=self)
+        else:
+            self.client.router.add("button_click", f"{self.prefix}:*", self.handle, owner=self)
+
+        try:
+            self.message = await self.client.send_component_msg(
+                channel, self._content(), components=self._components(), **kwargs
+            )
+        except BaseException:
+            self.client.router.remove_object(self)
+            raise
+        self._rendered_at = monotonic()
+
+        self.client.evictions.track(self.message, self._deleted)
+        return self.message
+
+    def _option(self, interaction: Interaction) -> Optional[int]:
+        data = interaction.raw_data["d"]["data"]
+        try:
+            if self.select:
+                return int(data["values"][0])
+            return int(data["custom_id"][len(self.prefix) + 1 :])
+        except (KeyError, IndexError, ValueError):
+            return None
+
+    async def handle(self, interaction: Interaction):
+        index = self._option(interaction)
+        if index is None or not 0 <= index < len(self.options):
+            return
+        if self.closed:
+            await self._poll_closed.respond(interaction)
+            return
+
+        user_id = interaction.user.id
+        previous = self._votes.get(user_id)
+        if previous is not None and (previous == index or not self.allow_change):
+            await self._already_voted.respond(interaction)
+            return
+
+        if previous is not None:
+            self._counts[previous] -= 1
+        self._counts[index] += 1
+        self._votes[user_id] = index
+
+        self._dirty = True
+        self._schedule_render()
+        await self._replies[index].respond(interaction)
+
+    def _schedule_render(self):
+        if self._render_task is None and self._dirty and not self.closed:
+            delay = self._rendered_at + self.render_interval - monotonic()
+            self._render_task = self.client.bot.loop.create_task(self._render_later(delay))
+
+    async def _render_later(self, delay: float):
+        try:
+            if delay > 0:
+                await sleep(delay)
+            await self._render()
+        except NotFound:
+            # Deleted without the event reaching us; nothing left to render to.
+            self.client.evictions.untrack(self.message.id, self._deleted)
+            self._forget()
+        except Exception:
+            # The totals stay dirty and are rendered again after render_interval.
+            log.exception("Failed to render the totals of poll %r.", self.question)
+        finally:
+            self._render_task = None
+            # Votes that arrived while the edit was in flight need another render.
+            self._schedule_render()
+
+    async def _render(self):
+        if self.message is None:
+            return
+        self._dirty = False
+        self._rendered_at = monotonic()
+        try:
+            await self.client.edit_component_msg(
+                self.message, self._content(), components=self._components()
+            )
+        except BaseException:
+            self._dirty = True
+            raise
+
+    async def close(self) -> Dict[str, int]:
+        """Stops accepting votes, renders the final totals and returns them.
+
+        The poll stays routed until its message is deleted, so clicks on the
+        still-enabled select are told that the poll is closed. If the final
+        render fails, the error is raised and calling this again retries it.
+        """
+        if not self.closed:
+            self.closed = True
+            # The final render also disables the buttons.
+            self._dirty = True
+            if self._render_task is not None:
+                self._render_task.cancel()
+        if self._dirty:
+            await self._render()
+        return self.results()
+
+    def _forget(self):
+        self.closed = True
+        self.message = None
+        self.client.router.remove_object(self)
+
+    def _deleted(self, message_id: int):
+        self._forget()
+        if self._render_task is not None:
+            self._render_task.cancel()
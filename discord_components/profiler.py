@@ -0,0 +1,154 @@
+from asyncio import current_task
+from contextvars import ContextVar
+from functools import wraps
+from random import random
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, Union
+
+
+__all__ = ("Profiler",)
+
+
+_current_stack: ContextVar[Optional[tuple]] = ContextVar(
+    "discord_components_profiler_stack", default=None
+)
+
+
+def _owner():
+    try:
+        return current_task()
+    except RuntimeError:
+        return None
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_stage = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_path", "_token", "_start")
+
+    def __init__(self, profiler: "Profiler", path: Optional[Tuple[str, ...]]):
+        self._profiler = profiler
+        self._path = path
+
+    def __enter__(self):
+        self._token = _current_stack.set((_owner(), self._path))
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter() - self._start
+        _current_stack.reset(self._token)
+        if self._path is not None:
+            self._profiler._record(self._path, elapsed)
+        return False
+
+
+class Profiler:
+    """Samples wall-clock timings of the library's hot paths.
+
+    Stages nest, so ``on_socket_response`` is split into ``_get_interaction``,
+    ``from_json`` and ``dispatch``. Only a ``sample_rate`` fraction of top-level
+    stages is measured, and a disabled profiler costs a single attribute check.
+    """
+
+    __slots__ = ("enabled", "sample_rate", "_stats")
+
+    def __init__(self, *, enabled: bool = False, sample_rate: float = 1.0):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._stats: Dict[Tuple[str, ...], List[float]] = {}
+
+    def enable(self, sample_rate: float = None):
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self._stats = {}
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _null_stage
+
+        current = _current_stack.get()
+        if current is None or current[0] is not _owner():
+            # Top-level stage, or a stage inherited by a task spawned from one.
+            if random() >= self.sample_rate:
+                return _Stage(self, None)
+            return _Stage(self, (name,))
+
+        parent = current[1]
+        if parent is None:
+            return _null_stage
+        return _Stage(self, parent + (name,))
+
+    def _record(self, path: Tuple[str, ...], elapsed: float):
+        stats = self._stats.get(path)
+        if stats is None:
+            self._stats[path] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+    def stats(self) -> Dict[str, dict]:
+        result = {}
+        for path, (count, total, maximum) in self._stats.items():
+            stage = result.setdefault(path[-1], {"count": 0, "total": 0.0, "max": 0.0})
+            stage["count"] += count
+            stage["total"] += total
+            stage["max"] = max(stage["max"], maximum)
+
+        for stage in result.values():
+            stage["mean"] = stage["total"] / stage["count"]
+        return result
+
+    def collapsed(self) -> List[str]:
+        children: Dict[Tuple[str, ...], float] = {}
+        for path, (_, total, _) in self._stats.items():
+            if len(path) > 1:
+                children[path[:-1]] = children.get(path[:-1], 0.0) + total
+
+        lines = []
+        for path, (_, total, _) in sorted(self._stats.items()):
+            own = max(total - children.get(path, 0.0), 0.0)
+            lines.append(f"{';'.join(path)} {round(own * 1_000_000)}")
+        return lines
+
+    def dump(self, fp: Union[str, TextIO] = None) -> str:
+        """Writes the samples in the collapsed-stack format read by ``flamegraph.pl``
+        and speedscope. Values are microseconds of self time."""
+        output = "\n".join(self.collapsed()) + "\n"
+        if isinstance(fp, str):
+            with open(fp, "w", encoding="utf-8") as f:
+                f.write(output)
+        elif fp is not None:
+            fp.write(output)
+        return output
+
+    @staticmethod
+    def profiled(name: str, getter: Callable = lambda self: self.profiler):
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                with getter(self).stage(name):
+                    return await func(self, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,174 @@
+from asyncio import Task, current_task, ensure_future, shield
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .interaction import Interaction
+from .select import Select, Option
+
+
+__all__ = ("OptionProvider", "DynamicSelect", "SelectChain")
+
+
+_MISSING = object()
+
+
+def _guild_key(context: Any) -> Hashable:
+    if context is None or isinstance(context, (int, str, tuple)):
+        return context
+
+    guild = getattr(context, "guild", None)
+    if guild is not None:
+        return guild.id
+    channel = getattr(context, "channel", None)
+    return channel.id if channel is not None else None
+
+
+class OptionProvider:
+    """Caches option lists produced by an async ``fetch(key)``.
+
+    Entries expire after ``ttl`` seconds and at most ``maxsize`` keys are kept.
+    Concurrent lookups of the same key share a single fetch. A fetch still
+    running when its key is invalidated is not cached, and later lookups
+    start a new one.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable], Awaitable[List[Option]]],
+        *,
+        ttl: float = 60,
+        maxsize: int = 1024,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self._cache: "OrderedDict[Hashable, Tuple[float, List[Option]]]" = OrderedDict()
+        self._pending: Dict[Hashable, Task] = {}
+
+    async def _load(self, key: Hashable) -> List[Option]:
+        options = list(await self.fetch(key))
+        if self._pending.get(key) is not current_task():
+            # Invalidated while fetching.
+            return options
+
+        self._cache[key] = (monotonic() + self.ttl, options)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return options
+
+    async def get(self, key: Hashable = None) -> List[Option]:
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] > monotonic():
+                self._cache.move_to_end(key)
+                return entry[1]
+            del self._cache[key]
+
+        task = self._pending.get(key)
+        if task is None:
+            task = ensure_future(self._load(key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._done(key, task))
+        return await shield(task)
+
+    def _done(self, key: Hashable, task: Task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+
+    def invalidate(self, key: Hashable = _MISSING):
+        if key is _MISSING:
+            self._cache.clear()
+            self._pending.clear()
+        else:
+            self._cache.pop(key, None)
+            self._pending.pop(key, None)
+
+
+class DynamicSelect:
+    """A select whose options come from an :class:`OptionProvider`.
+
+    ``build`` resolves the options for a context (a guild id by default, taken
+    from a ``Context``, ``Interaction`` or any object with a ``guild``) and
+    returns a regular :class:`Select` with its own copies of the options.
+    """
+
+    def __init__(
+        self,
+        provider: OptionProvider,
+        *,
+        id: str = None,
+        placeholder: str = None,
+        min_values: int = None,
+        max_values: int = None,
+        key: Callable[[Any], Hashable] = _guild_key,
+    ):
+        self.provider = provider
+        self.id = id
+        self.placeholder = placeholder
+        self.min_values = min_values
+        self.max_values = max_values
+        self.key = key
+
+    async def build(self, context: Any = None) -> Select:
+        options = await self.provider.get(self.key(context))
+        return Select(
+            options=[option._clone() for option in options],
+            id=self.id,
+            placeholder=self.placeholder,
+            min_values=self.min_values,
+            max_values=self.max_values,
+        )
+
+
+class SelectChain:
+    """Drill-down selects where every level is fetched from the previous choice.
+
+    Level ``0`` is keyed like :class:`DynamicSelect`. Level ``n`` is keyed by
+    ``(level 0 key, choice)``, where the choice is the value picked at level
+    ``n - 1`` (a tuple when several values were chosen), so two guilds picking
+    the same value don't share options. It is only fetched once that choice
+    arrives.
+    """
+
+    def __init__(
+        self,
+        levels: List[OptionProvider],
+        *,
+        prefix: str = "chain",
+        placeholders: List[Optional[str]] = None,
+        key: Callable[[Any], Hashable] = _guild_key,
+    ):
+        self.levels = levels
+        self.prefix = prefix
+        self.placeholders = placeholders or [None] * len(levels)
+        self.key = key
+
+    def level_of(self, custom_id: str) -> Optional[int]:
+        prefix, _, level = custom_id.rpartition(":")
+        if prefix != self.prefix or not level.isdigit():
+            return None
+        return int(level)
+
+    async def _select(self, level: int, key: Hashable) -> Select:
+        options = await self.levels[level].get(key)
+        return Select(
+            options=[option._clone() for option in options],
+            id=f"{self.prefix}:{level}",
+            placeholder=self.placeholders[level],
+        )
+
+    async def first(self, context: Any = None) -> Select:
+        return await self._select(0, self.key(context))
+
+    async def next(self, interaction: Interaction) -> Optional[Select]:
+        data = interaction.raw_data["d"]["data"]
+        level = self.level_of(data["custom_id"])
+        if level is None or level + 1 >= len(self.levels):
+            return None
+
+        values = data.get("values", [])
+        choice = values[0] if len(values) == 1 else tuple(values)
+        return await self._select(level + 1, (self.key(interaction), choice))
@@ -0,0 +1,104 @@
+from discord import File
+
+from asyncio import Future, get_running_loop
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, Hashable, Union
+
+from .cache import LRUCache
+
+
+__all__ = ("Renderer",)
+
+
+Producer = Callable[..., Union[bytes, bytearray, memoryview, BytesIO]]
+
+
+def _produce(producer: Producer, *args: Any) -> bytes:
+    # Runs in the worker, so any conversion happens off the event loop too.
+    result = producer(*args)
+    if isinstance(result, BytesIO):
+        return result.getvalue()
+    if isinstance(result, bytes):
+        return result
+    return bytes(result)
+
+
+class Renderer:
+    """Runs attachment producers (e.g. PIL drawing code) off the event loop.
+
+    ``producer(*args)`` runs in a thread pool, or in a process pool with
+    ``executor="process"`` (the producer and its arguments must then be
+    picklable), and returns the encoded file as bytes or a ``BytesIO``.
+    :meth:`render` wraps the result in a :class:`discord.File` that can be
+    passed to ``send``, ``edit`` or ``respond``. Renders given a ``key``
+    are cached, and concurrent renders of the same key run once; every
+    returned file reads the same immutable buffer, so nothing is copied.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Union[str, Executor] = "thread",
+        max_workers: int = None,
+        cache_size: int = 64,
+    ):
+        if executor not in ("thread", "process") and not isinstance(executor, Executor):
+            raise ValueError('executor must be "thread", "process" or an Executor.')
+
+        self.cache = LRUCache(cache_size)
+
+        self._executor = executor
+        self._max_workers = max_workers
+        self._owns_executor = isinstance(executor, str)
+        self._pending: Dict[Hashable, Future] = {}
+
+    @property
+    def executor(self) -> Executor:
+        # Created on first use, so a renderer that is never used costs no threads.
+        if self._executor == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="discord-components-render"
+            )
+        elif self._executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    async def render_bytes(self, producer: Producer, *args: Any, key: Hashable = None) -> bytes:
+        if key is None:
+            return await get_running_loop().run_in_executor(
+                self.executor, _produce, producer, *args
+            )
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = get_running_loop().create_task(
+                self._render_cached(key, producer, args)
+            )
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await pending
+
+    async def _render_cached(self, key: Hashable, producer: Producer, args: tuple) -> bytes:
+        data = await get_running_loop().run_in_executor(self.executor, _produce, producer, *args)
+        self.cache[key] = data
+        return data
+
+    async def render(
+        self,
+        producer: Producer,
+        *args: Any,
+        filename: str,
+        key: Hashable = None,
+        spoiler: bool = False,
+    ) -> File:
+        data = await self.render_bytes(producer, *args, key=key)
+        # BytesIO shares the bytes object until it is written to.
+        return File(BytesIO(data), filename=filename, spoiler=spoiler)
+
+    def close(self):
+        if self._owns_executor and isinstance(self._executor, Executor):
+            self._executor.shutdown(wait=False)
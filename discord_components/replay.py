@@ -0,0 +1,184 @@
+from discord.http import HTTPClient, Route
+
+import gzip
+from asyncio import sleep
+from itertools import count
+from json import dumps, loads
+from time import monotonic
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+__all__ = ("Recorder", "Replayer", "StubHTTPClient")
+
+
+def _open(path: str, mode: str, compress: Optional[bool]):
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Recorder:
+    """Appends raw gateway payloads to a JSON lines file.
+
+    Each line is ``[seconds_since_start, payload]``. Files ending in ``.gz``
+    are gzip-compressed unless ``compress`` says otherwise. Assign a recorder
+    to ``DiscordComponents.recorder`` to capture what ``on_socket_response``
+    sees; by default only ``INTERACTION_CREATE`` payloads are kept.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        compress: bool = None,
+        events: Optional[Sequence[str]] = ("INTERACTION_CREATE",),
+    ):
+        self.path = path
+        self.events = frozenset(events) if events is not None else None
+        self.count = 0
+
+        self._file = _open(path, "a", compress)
+        self._start = monotonic()
+
+    def record(self, payload: dict):
+        if self._file is None:
+            return
+        if self.events is not None and payload.get("t") not in self.events:
+            return
+
+        self._file.write(
+            dumps(
+                [round(monotonic() - self._start, 6), payload],
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        )
+        self._file.write("\n")
+        self.count += 1
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Replayer:
+    """Feeds a recording back through ``DiscordComponents.on_socket_response``.
+
+    ``speed`` scales the recorded gaps (``2`` replays twice as fast); ``None``
+    replays without waiting. Replayed interactions skip the client's
+    ``deduplicator`` unless ``dedup=True``, since their ids were already seen
+    when they were recorded and would otherwise be dropped when replaying
+    through the recording client or replaying a file twice.
+    """
+
+    def __init__(self, path: str, *, compress: bool = None):
+        self.path = path
+        self.compress = compress
+
+    def __iter__(self) -> Iterator[Tuple[float, dict]]:
+        with _open(self.path, "r", self.compress) as f:
+            for line in f:
+                if line.strip():
+                    offset, payload = loads(line)
+                    yield offset, payload
+
+    async def replay(
+        self, client: "DiscordComponents", *, speed: Optional[float] = 1.0, dedup: bool = False
+    ) -> int:
+        started = monotonic()
+        replayed = 0
+        for offset, payload in self:
+            if speed:
+                delay = offset / speed - (monotonic() - started)
+                if delay > 0:
+                    await sleep(delay)
+
+            await client.on_socket_response(payload, dedup=dedup)
+            replayed += 1
+        return replayed
+
+
+class StubHTTPClient(HTTPClient):
+    """Answers the routes used by this library without touching the network.
+
+    Message routes return a minimal message payload built from the request;
+    interaction callbacks return nothing. Every request is kept in
+    ``requests`` as ``(method, path, kwargs)``. Only :meth:`request` is
+    replaced, so discord.py's own helpers such as ``send_message`` go
+    through the stub as well.
+    """
+
+    def __init__(self, *, user_id: int = 0, keep_requests: bool = True, loop=None):
+        super().__init__(loop=loop)
+        self.user_id = user_id
+        self.keep_requests = keep_requests
+        self.requests: List[Tuple[str, str, dict]] = []
+        self.counts: Dict[str, int] = {}
+
+        self._ids = count(1)
+
+    @classmethod
+    def install(cls, bot, **kwargs) -> "StubHTTPClient":
+        kwargs.setdefault("loop", bot.loop)
+        stub = cls(**kwargs)
+        bot.http = stub
+        bot._connection.http = stub
+        return stub
+
+    def _message(self, channel_id: str, message_id: str = None, data: dict = None) -> dict:
+        data = data or {}
+        return {
+            "id": message_id or str(next(self._ids)),
+            "channel_id": channel_id,
+            "author": {
+                "id": str(self.user_id),
+                "username": "stub",
+                "discriminator": "0000",
+                "avatar": None,
+                "bot": True,
+            },
+            "content": data.get("content") or "",
+            "timestamp": "1970-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": bool(data.get("tts")),
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [data["embed"]] if data.get("embed") else [],
+            "pinned": False,
+            "type": 0,
+            "components": data.get("components") or [],
+        }
+
+    async def request(self, route: Route, *, files=None, form=None, **kwargs):
+        # discord.py's own routes keep the path template; the url has it filled in.
+        path = route.url[len(Route.BASE) :]
+        key = f"{route.method} {path}"
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.keep_requests:
+            self.requests.append((route.method, path, kwargs))
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "channels" and len(parts) >= 3 and parts[2] == "messages":
+            data = kwargs.get("json")
+            if "data" in kwargs and not isinstance(kwargs["data"], dict):
+                # Multipart uploads carry the payload in a form field.
+                for options, _, value in kwargs["data"]._fields:
+                    if options.get("name") == "payload_json":
+                        data = loads(value)
+            return self._message(parts[1], parts[3] if len(parts) > 3 else None, data)
+        return None
@@ -0,0 +1,130 @@
+from discord import InvalidArgument
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .interaction import InteractionEventType
+
+
+__all__ = ("on_click", "on_select", "Router")
+
+
+Handler = Callable[..., Awaitable[None]]
+
+
+def _route(event: str, pattern: str):
+    def decorator(func: Handler) -> Handler:
+        routes = getattr(func, "__component_routes__", ())
+        func.__component_routes__ = routes + ((event, pattern),)
+        return func
+
+    return decorator
+
+
+def on_click(pattern: str):
+    """Routes button clicks whose custom_id equals ``pattern``, or starts with it when
+    ``pattern`` ends with ``*``."""
+    return _route("button_click", pattern)
+
+
+def on_select(pattern: str):
+    """Like :func:`on_click`, for select menus."""
+    return _route("select_option", pattern)
+
+
+class _Node:
+    __slots__ = ("children", "handler")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.handler: Optional[Handler] = None
+
+
+class Router:
+    """Maps ``(event, custom_id)`` to exactly one handler.
+
+    Exact patterns live in a dict and ``prefix*`` patterns in a character trie,
+    so a lookup costs one dict access plus a walk over the custom_id. Exact
+    matches win over prefixes and longer prefixes win over shorter ones.
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Dict[str, Handler]] = {event: {} for event in InteractionEventType}
+        self._prefixes: Dict[str, _Node] = {event: _Node() for event in InteractionEventType}
+        self._owners: Dict[int, List[Tuple[str, str]]] = {}
+
+    def add(self, event: str, pattern: str, handler: Handler, *, owner: Any = None):
+        if event not in self._exact:
+            raise InvalidArgument(f"Unknown component event {event!r}.")
+
+        if pattern.endswith("*"):
+            node = self._prefixes[event]
+            for char in pattern[:-1]:
+                node = node.children.setdefault(char, _Node())
+            if node.handler is not None:
+                raise InvalidArgument(f"A handler for {event} {pattern!r} is already registered.")
+            node.handler = handler
+        else:
+            if pattern in self._exact[event]:
+                raise InvalidArgument(f"A handler for {event} {pattern!r} is already registered.")
+            self._exact[event][pattern] = handler
+
+        self._owners.setdefault(id(owner), []).append((event, pattern))
+
+    def remove(self, event: str, pattern: str):
+        if not pattern.endswith("*"):
+            self._exact[event].pop(pattern, None)
+            return
+
+        path = [self._prefixes[event]]
+        for char in pattern[:-1]:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+
+        path[-1].handler = None
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if node.handler is not None or node.children:
+                break
+            del path[depth - 1].children[pattern[depth - 1]]
+
+    def add_object(self, obj: Any):
+        names = {
+            name
+            for cls in type(obj).__mro__
+            for name, value in vars(cls).items()
+            if hasattr(value, "__component_routes__")
+        }
+
+        added = []
+        try:
+            for name in names:
+                method = getattr(obj, name)
+                for event, pattern in method.__component_routes__:
+                    self.add(event, pattern, method, owner=obj)
+                    added.append((event, pattern))
+        except InvalidArgument:
+            for event, pattern in added:
+                self.remove(event, pattern)
+            self._owners.pop(id(obj), None)
+            raise
+
+    def remove_object(self, obj: Any):
+        for event, pattern in self._owners.pop(id(obj), ()):
+            self.remove(event, pattern)
+
+    def resolve(self, event: str, custom_id: str) -> Optional[Handler]:
+        handler = self._exact[event].get(custom_id)
+        if handler is not None:
+            return handler
+
+        node = self._prefixes[event]
+        handler = node.handler
+        for char in custom_id:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.handler is not None:
+                handler = node.handler
+        return handler
@@ -0,0 +1,178 @@
+from asyncio import Future, TimeoutError, ensure_future, get_running_loop
+from heapq import heappop, heappush
+from itertools import count
+from math import inf
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+__all__ = ("RequestClass", "RequestScheduler")
+
+
+class RequestClass:
+    callback: int = 0
+    followup: int = 1
+    edit: int = 2
+    send: int = 3
+    fetch: int = 4
+
+
+_CLASS_NAMES = {
+    value: name for name, value in vars(RequestClass).items() if not name.startswith("_")
+}
+
+
+class _ClassStats:
+    __slots__ = (
+        "submitted",
+        "completed",
+        "failed",
+        "expired",
+        "queued",
+        "in_flight",
+        "wait_total",
+        "wait_max",
+    )
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+        self.queued = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        started = self.completed + self.failed + self.in_flight
+        return {
+            **{name: getattr(self, name) for name in self.__slots__},
+            "wait_avg": self.wait_total / started if started else 0.0,
+        }
+
+
+class RequestScheduler:
+    """Orders outgoing HTTP requests once more than ``concurrency`` are in flight.
+
+    Queued interaction callbacks go first, earliest deadline first, and are
+    dropped with ``TimeoutError`` once their deadline has passed, since
+    Discord would reject them anyway. Followups, edits, sends and fetches
+    follow in that order, first in first out within a class. ``reserved``
+    slots are kept for callbacks, so requests stuck behind a rate limit can
+    never hold every slot.
+    """
+
+    def __init__(self, *, concurrency: int = 50, reserved: int = 5):
+        if not 0 <= reserved < concurrency:
+            raise ValueError("reserved must be at least 0 and less than concurrency.")
+
+        self.concurrency = concurrency
+        self.reserved = reserved
+
+        self._queue: List[tuple] = []
+        self._sequence = count()
+        self._in_flight = 0
+        self._stats = {request_class: _ClassStats() for request_class in _CLASS_NAMES}
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _limit(self, request_class: int) -> int:
+        if request_class == RequestClass.callback:
+            return self.concurrency
+        return self.concurrency - self.reserved
+
+    async def submit(
+        self,
+        request_class: int,
+        request: Callable[[], Awaitable[Any]],
+        *,
+        deadline: float = None,
+    ) -> Any:
+        """Runs ``request()`` when a slot is free. ``deadline`` is in ``time.monotonic()`` time."""
+        stats = self._stats[request_class]
+        stats.submitted += 1
+        if deadline is not None and monotonic() >= deadline:
+            # Expired before a slot was even looked for; queued requests are checked in _pump.
+            stats.expired += 1
+            raise TimeoutError()
+
+        if (
+            not self._queue or request_class < self._queue[0][0]
+        ) and self._in_flight < self._limit(request_class):
+            self._in_flight += 1
+            stats.in_flight += 1
+            try:
+                result = await request()
+            except BaseException:
+                stats.failed += 1
+                raise
+            else:
+                stats.completed += 1
+                return result
+            finally:
+                self._in_flight -= 1
+                stats.in_flight -= 1
+                self._pump()
+
+        future = get_running_loop().create_future()
+        heappush(
+            self._queue,
+            (
+                request_class,
+                inf if deadline is None else deadline,
+                next(self._sequence),
+                request,
+                future,
+                monotonic(),
+            ),
+        )
+        stats.queued += 1
+        return await future
+
+    def _pump(self):
+        while self._queue:
+            request_class, deadline, _, request, future, queued_at = self._queue[0]
+            if self._in_flight >= self._limit(request_class):
+                return
+
+            heappop(self._queue)
+            stats = self._stats[request_class]
+            stats.queued -= 1
+            if future.done():
+                continue
+
+            now = monotonic()
+            if now >= deadline:
+                stats.expired += 1
+                future.set_exception(TimeoutError())
+                continue
+
+            stats.wait_total += now - queued_at
+            stats.wait_max = max(stats.wait_max, now - queued_at)
+            self._in_flight += 1
+            stats.in_flight += 1
+            ensure_future(self._run(stats, request, future))
+
+    async def _run(self, stats: _ClassStats, request: Callable[[], Awaitable[Any]], future: Future):
+        try:
+            result = await request()
+        except BaseException as error:
+            stats.failed += 1
+            if not future.done():
+                future.set_exception(error)
+        else:
+            stats.completed += 1
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            stats.in_flight -= 1
+            self._pump()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            _CLASS_NAMES[request_class]: stats.to_dict()
+            for request_class, stats in self._stats.items()
+        }
@@ -1,9 +1,9 @@
-from discord import InvalidArgument, PartialEmoji, Emoji
+from typing import TYPE_CHECKING, List, Union
 
-from typing import List, Union
-from uuid import uuid1
+from .component import Component, _clone_emoji, _emoji_from_json, _intern, _new_id, _partial_emoji
 
-from .component import Component
+if TYPE_CHECKING:
+    from discord import Emoji, PartialEmoji
 
 
 __all__ = ("Select", "Option")
@@ -17,7 +17,7 @@ class Option(Component):
         *,
         label: str,
         value: str,
-        emoji: Union[Emoji, PartialEmoji, str] = None,
+        emoji: Union["Emoji", "PartialEmoji", str] = None,
         description: str = None,
         default: bool = False,
     ):
@@ -25,15 +25,7 @@ class Option(Component):
         self._value = value
         self._description = description
         self._default = default
-
-        if isinstance(emoji, Emoji):
-            self._emoji = PartialEmoji(name=emoji.name, animated=emoji.animated, id=emoji.id)
-        elif isinstance(emoji, PartialEmoji):
-            self._emoji = emoji
-        elif isinstance(emoji, str):
-            self._emoji = PartialEmoji(name=emoji)
-        else:
-            self._emoji = None
+        self._emoji = _partial_emoji(emoji)
 
     def to_dict(self) -> dict:
         data = {
@@ -46,6 +38,15 @@ class Option(Component):
             data["emoji"] = self.emoji.to_dict()
         return data
 
+    def _clone(self) -> "Option":
+        option = Option.__new__(Option)
+        option._label = self._label
+        option._value = self._value
+        option._description = self._description
+        option._default = self._default
+        option._emoji = _clone_emoji(self._emoji)
+        return option
+
     @property
     def label(self) -> str:
         return self._label
@@ -55,7 +56,7 @@ class Option(Component):
         return self._value
 
     @property
-    def emoji(self) -> PartialEmoji:
+    def emoji(self) -> "PartialEmoji":
         return self._emoji
 
     @property
@@ -68,9 +69,6 @@ class Option(Component):
 
     @label.setter
     def label(self, value: str):
-        if not len(value):
-            raise InvalidArgument("Label must not be empty.")
-
         self._label = value
 
     @value.setter
@@ -78,13 +76,10 @@ class Option(Component):
         self._value = value
 
     @emoji.setter
-    def emoji(self, emoji: Union[Emoji, PartialEmoji, str]):
-        if isinstance(emoji, Emoji):
-            self._emoji = PartialEmoji(name=emoji.name, animated=emoji.animated, id=emoji.id)
-        elif isinstance(emoji, PartialEmoji):
+    def emoji(self, emoji: Union["Emoji", "PartialEmoji", str]):
+        emoji = _partial_emoji(emoji)
+        if emoji is not None:
             self._emoji = emoji
-        elif isinstance(emoji, str):
-            self._emoji = PartialEmoji(name=emoji)
 
     @description.setter
     def description(self, value: str):
@@ -96,18 +91,13 @@ class Option(Component):
 
     @staticmethod
     def from_json(data: dict):
-        emoji = data.get("emoji")
-        return Option(
-            label=data["label"],
-            value=data["value"],
-            emoji=PartialEmoji(
-                name=emoji["name"], animated=emoji.get("animated", False), id=emoji.get("id")
-            )
-            if emoji
-            else None,
-            description=data.get("description"),
-            default=data.get("default", False),
-        )
+        option = Option.__new__(Option)
+        option._label = _intern(data["label"])
+        option._value = _intern(data["value"])
+        option._description = _intern(data.get("description"))
+        option._default = data.get("default", False)
+        option._emoji = _emoji_from_json(data.get("emoji"))
+        return option
 
 
 class Select(Component):
@@ -122,10 +112,7 @@ class Select(Component):
         min_values: int = None,
         max_values: int = None,
     ):
-        if (not len(options)) or (len(options) > 25):
-            raise InvalidArgument("Options length should be between 1 and 25.")
-
-        self._id = id or str(uuid1())
+        self._id = id or _new_id()
         self._options = options
         self._placeholder = placeholder
         self._min_values = min_values
@@ -141,6 +128,15 @@ class Select(Component):
             "max_values": self.max_values,
         }
 
+    def _clone(self) -> "Select":
+        select = Select.__new__(Select)
+        select._id = self._id
+        select._options = [option._clone() for option in self._options]
+        select._placeholder = self._placeholder
+        select._min_values = self._min_values
+        select._max_values = self._max_values
+        return select
+
     @property
     def id(self) -> str:
         return self._id
@@ -167,9 +163,6 @@ class Select(Component):
 
     @options.setter
     def options(self, value: List[Option]):
-        if (not len(value)) or (len(value) > 25):
-            raise InvalidArgument("Options length should be between 1 and 25.")
-
         self._options = value
 
     @placeholder.setter
@@ -186,10 +179,11 @@ class Select(Component):
 
     @staticmethod
     def from_json(data: dict):
-        return Select(
-            id=data["custom_id"],
-            options=list(map(lambda x: Option.from_json(x), data["options"])),
-            placeholder=data.get("placeholder"),
-            min_values=data.get("min_values"),
-            max_values=data.get("max_values"),
-        )
+        # Payloads come from the API (or were serialized by us), so skip __init__.
+        select = Select.__new__(Select)
+        select._id = _intern(data["custom_id"])
+        select._options = [Option.from_json(option) for option in data["options"]]
+        select._placeholder = data.get("placeholder")
+        select._min_values = data.get("min_values")
+        select._max_values = data.get("max_values")
+        return select
@@ -0,0 +1,239 @@
+from discord import Message
+from discord.http import Route
+
+from asyncio import CancelledError, Semaphore, TimeoutError, ensure_future, gather, sleep
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .interaction import Interaction
+from .scheduler import RequestClass
+
+
+__all__ = ("Session", "SessionManager")
+
+
+class Session:
+    __slots__ = (
+        "manager",
+        "message",
+        "components",
+        "on_timeout",
+        "disable",
+        "data",
+        "deadline",
+        "expired",
+        "closed",
+        "_rows",
+        "_waiters",
+    )
+
+    def __init__(
+        self,
+        manager: "SessionManager",
+        message: Message,
+        *,
+        components: List[Any],
+        on_timeout: Optional[Callable[["Session"], Awaitable[None]]],
+        disable: bool,
+        data: Any,
+        rows: Optional[List[dict]] = None,
+    ):
+        self.manager = manager
+        self.message = message
+        self.components = components
+        self.on_timeout = on_timeout
+        self.disable = disable
+        self.data = data
+        self.deadline = 0
+        self.expired = False
+        self.closed = False
+        self._rows = rows
+        self._waiters: Set = set()
+
+    def touch(self, timeout: float = None):
+        self.manager._schedule(self, timeout)
+
+    def close(self):
+        self.manager.close(self.message.id)
+
+    async def wait_for(
+        self, event: str = "button_click", check: Callable[[Interaction], bool] = None
+    ) -> Interaction:
+        if self.closed:
+            raise TimeoutError() if self.expired else RuntimeError("The session is closed.")
+
+        message_id = self.message.id
+
+        def _check(interaction: Interaction) -> bool:
+            return (
+                interaction.message is not None
+                and interaction.message.id == message_id
+                and (check is None or check(interaction))
+            )
+
+        waiter = ensure_future(self.manager.client.bot.wait_for(event, check=_check))
+        self._waiters.add(waiter)
+        try:
+            return await waiter
+        except CancelledError:
+            if self.expired:
+                raise TimeoutError() from None
+            raise
+        finally:
+            self._waiters.discard(waiter)
+
+
+class SessionManager:
+    """Expires component sessions from a single timer wheel.
+
+    Instead of one ``asyncio.sleep`` per prompt, sessions are hashed into
+    ``slots`` buckets of ``resolution`` seconds and one scheduler task sweeps a
+    bucket per tick. Sessions expiring on the same tick get their "disable
+    everything" edits sent together, and their state is dropped right after.
+    """
+
+    def __init__(
+        self,
+        client: "DiscordComponents",
+        *,
+        timeout: float = 60,
+        resolution: float = 1.0,
+        slots: int = 64,
+        edit_concurrency: int = 5,
+    ):
+        self.client = client
+        self.timeout = timeout
+        self.resolution = resolution
+
+        self._wheel: List[Set[Session]] = [set() for _ in range(slots)]
+        self._sessions: Dict[int, Session] = {}
+        self._tick = 0
+        self._task = None
+        self._edit_semaphore = Semaphore(edit_concurrency)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._sessions
+
+    def get(self, message_id: int) -> Optional[Session]:
+        return self._sessions.get(message_id)
+
+    def open(
+        self,
+        message: Message,
+        *,
+        timeout: float = None,
+        components: List[Any] = None,
+        on_timeout: Callable[[Session], Awaitable[None]] = None,
+        disable: bool = True,
+        data: Any = None,
+    ) -> Session:
+        self.close(message.id)
+
+        session = Session(
+            self,
+            message,
+            components=components if components is not None else message.components,
+            on_timeout=on_timeout,
+            disable=disable,
+            data=data,
+            rows=getattr(message, "_component_rows", None) if components is None else None,
+        )
+        self._sessions[message.id] = session
+        self._schedule(session, timeout)
+        self.client.evictions.track(message, self._deleted)
+
+        if self._task is None or self._task.done():
+            self._task = self.client.bot.loop.create_task(self._run())
+        return session
+
+    def close(self, message_id: int) -> Optional[Session]:
+        session = self._sessions.pop(message_id, None)
+        if session is None:
+            return None
+
+        self._wheel[session.deadline % len(self._wheel)].discard(session)
+        self._release(session)
+        return session
+
+    def _deleted(self, message_id: int):
+        self.close(message_id)
+
+    def _schedule(self, session: Session, timeout: Optional[float]):
+        if session.closed:
+            return
+
+        self._wheel[session.deadline % len(self._wheel)].discard(session)
+        ticks = max(1, round((self.timeout if timeout is None else timeout) / self.resolution))
+        session.deadline = self._tick + ticks
+        self._wheel[session.deadline % len(self._wheel)].add(session)
+
+    def _release(self, session: Session):
+        session.closed = True
+        if session.message.id not in self._sessions:
+            # A session expiring in the background may have been replaced by a new one.
+            self.client.evictions.untrack(session.message.id, self._deleted)
+        for waiter in list(session._waiters):
+            waiter.cancel()
+        session.components = None
+        session.data = None
+        session._rows = None
+
+    async def _run(self):
+        while self._sessions:
+            await sleep(self.resolution)
+            self._tick += 1
+
+            bucket = self._wheel[self._tick % len(self._wheel)]
+            expired = [session for session in bucket if session.deadline <= self._tick]
+            if not expired:
+                continue
+
+            bucket.difference_update(expired)
+            for session in expired:
+                del self._sessions[session.message.id]
+                session.expired = True
+                for waiter in list(session._waiters):
+                    waiter.cancel()
+
+            self.client.bot.loop.create_task(self._expire(expired))
+
+    async def _expire(self, sessions: List[Session]):
+        await gather(*(self._expire_one(session) for session in sessions), return_exceptions=True)
+
+    async def _expire_one(self, session: Session):
+        try:
+            async with self._edit_semaphore:
+                if session.on_timeout is not None:
+                    await session.on_timeout(session)
+                elif session.disable and session.components:
+                    message = session.message
+                    await self.client._request(
+                        RequestClass.edit,
+                        Route("PATCH", f"/channels/{message.channel.id}/messages/{message.id}"),
+                        json={"components": self._disabled(session)},
+                    )
+        finally:
+            self._release(session)
+
+    def _disabled(self, session: Session) -> List[dict]:
+        # Built from the row payloads rather than component objects, so selects are
+        # disabled too and the message keeps its row layout. The message's own rows are
+        # used while the session still holds its (possibly flat) component list.
+        if session._rows and session.components is getattr(session.message, "components", None):
+            rows = session._rows
+        else:
+            rows = self.client._get_components_json(session.components, validate=False)
+            rows = rows["components"]
+        return [
+            {
+                **row,
+                "components": [
+                    {**component, "disabled": True} for component in row["components"]
+                ],
+            }
+            if row["type"] == 1
+            else {"type": 1, "components": [{**row, "disabled": True}]}
+            for row in rows
+        ]
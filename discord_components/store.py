@@ -0,0 +1,269 @@
+from discord import Message
+
+from asyncio import CancelledError, Future, get_running_loop, sleep
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps, loads
+from typing import Any, Callable, Dict, Optional, Union
+import logging
+import sqlite3
+import zlib
+
+
+__all__ = ("StateBackend", "SQLiteBackend", "StateStore")
+
+
+log = logging.getLogger(__name__)
+
+_DELETED = object()
+_RAW, _COMPRESSED = b"j", b"z"
+
+
+def _encode(value: Any) -> bytes:
+    data = dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    if len(data) >= 256:
+        compressed = zlib.compress(data)
+        if len(compressed) < len(data):
+            return _COMPRESSED + compressed
+    return _RAW + data
+
+
+def _decode(data: bytes) -> Any:
+    if data[:1] == _COMPRESSED:
+        return loads(zlib.decompress(data[1:]))
+    return loads(data[1:])
+
+
+class StateBackend:
+    """Where a :class:`StateStore` persists its entries. ``None`` values in
+    ``save_many`` mean the entry was deleted."""
+
+    async def load(self, key: int) -> Optional[bytes]:
+        raise NotImplementedError()
+
+    async def save_many(self, items: Dict[int, Optional[bytes]]):
+        raise NotImplementedError()
+
+    async def close(self):
+        pass
+
+
+class SQLiteBackend(StateBackend):
+    """Stores entries in a local SQLite file, on a dedicated thread so the event loop never
+    blocks on disk."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS component_state "
+                "(key INTEGER PRIMARY KEY, data BLOB NOT NULL)"
+            )
+        return self._connection
+
+    def _load(self, key: int) -> Optional[bytes]:
+        row = (
+            self._connect()
+            .execute("SELECT data FROM component_state WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return row and row[0]
+
+    def _save_many(self, items: Dict[int, Optional[bytes]]):
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO component_state (key, data) VALUES (?, ?)",
+                [(key, data) for key, data in items.items() if data is not None],
+            )
+            connection.executemany(
+                "DELETE FROM component_state WHERE key = ?",
+                [(key,) for key, data in items.items() if data is None],
+            )
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def load(self, key: int) -> Optional[bytes]:
+        return await get_running_loop().run_in_executor(self._executor, self._load, key)
+
+    async def save_many(self, items: Dict[int, Optional[bytes]]):
+        await get_running_loop().run_in_executor(self._executor, self._save_many, items)
+
+    async def close(self):
+        await get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=False)
+
+
+class StateStore:
+    """Persistent state for interactive messages, keyed by message id.
+
+    Reads are served from an in-memory LRU of ``maxsize`` entries and loaded
+    from ``backend`` on a miss. Writes only mark the entry dirty; dirty
+    entries are written to the backend together every ``flush_interval``
+    seconds, so a click costs no database write. Values must be JSON
+    serializable (or use custom ``dumps``/``loads``); call :meth:`set` again
+    after changing a value in place. Entries set or read with a
+    :class:`Message` are deleted along with the message, so entries persisted
+    before a restart are tracked again once read; entries only ever accessed
+    by id must be removed with :meth:`delete`. An entry that ``dumps`` cannot
+    serialize is logged, counted in ``serialize_errors`` and left out of the
+    flush, without holding back the other entries; failed backend writes are
+    logged and retried on the next flush.
+    """
+
+    def __init__(
+        self,
+        client: "DiscordComponents",
+        backend: StateBackend,
+        *,
+        maxsize: int = 10_000,
+        flush_interval: float = 5.0,
+        dumps: Callable[[Any], bytes] = _encode,
+        loads: Callable[[bytes], Any] = _decode,
+    ):
+        self.client = client
+        self.backend = backend
+        self.maxsize = maxsize
+        self.flush_interval = flush_interval
+        self.dumps = dumps
+        self.loads = loads
+        self.serialize_errors = 0
+        self.closed = False
+
+        self._hot: "OrderedDict[int, Any]" = OrderedDict()
+        self._dirty: Dict[int, Any] = {}
+        self._loading: Dict[int, Future] = {}
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._hot)
+
+    def _remember(self, key: int, value: Any):
+        self._hot[key] = value
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.maxsize:
+            self._hot.popitem(last=False)
+
+    async def get(self, message: Union[Message, int], default: Any = None) -> Any:
+        if isinstance(message, Message):
+            value = await self._get(message.id)
+            if value is not _DELETED:
+                self.client.evictions.track(message, self._deleted)
+        else:
+            value = await self._get(int(message))
+        return default if value is _DELETED else value
+
+    async def _get(self, key: int) -> Any:
+        if key in self._hot:
+            self._hot.move_to_end(key)
+            return self._hot[key]
+
+        if key in self._dirty:
+            return self._dirty[key]
+
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = self._loading[key] = get_running_loop().create_task(self._load(key))
+            loading.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await loading
+
+    async def _load(self, key: int) -> Any:
+        data = await self.backend.load(key)
+        # A set() or delete() while loading is newer than what was stored.
+        if key in self._dirty:
+            return self._dirty[key]
+        if key in self._hot:
+            return self._hot[key]
+        if data is None:
+            return _DELETED
+
+        value = self.loads(data)
+        self._remember(key, value)
+        return value
+
+    def set(self, message: Union[Message, int], value: Any):
+        if isinstance(message, Message):
+            key = message.id
+            self.client.evictions.track(message, self._deleted)
+        else:
+            key = int(message)
+
+        self._remember(key, value)
+        self._dirty[key] = value
+        self._start()
+
+    def delete(self, message: Union[Message, int]):
+        key = message.id if isinstance(message, Message) else int(message)
+        self._hot.pop(key, None)
+        self._dirty[key] = _DELETED
+        self.client.evictions.untrack(key, self._deleted)
+        self._start()
+
+    def _deleted(self, message_id: int):
+        # Messages tracked before close() may still be deleted afterwards.
+        if not self.closed:
+            self.delete(message_id)
+
+    def _start(self):
+        if self._task is None or self._task.done():
+            self._task = self.client.bot.loop.create_task(self._run())
+
+    async def _run(self):
+        while self._dirty:
+            await sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # The entries stay dirty and are retried on the next tick.
+                log.exception("Failed to write %d state entries, retrying.", len(self._dirty))
+
+    def _serialize(self, dirty: Dict[int, Any]) -> Dict[int, Optional[bytes]]:
+        items = {}
+        for key, value in dirty.items():
+            if value is _DELETED:
+                items[key] = None
+                continue
+            try:
+                items[key] = self.dumps(value)
+            except Exception:
+                # Retrying would fail the same way, so the entry is only kept in memory.
+                self.serialize_errors += 1
+                log.exception("Could not serialize the state of message %d, skipping it.", key)
+        return items
+
+    async def flush(self):
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, {}
+        items = self._serialize(dirty)
+        try:
+            if items:
+                await self.backend.save_many(items)
+        except BaseException:
+            # Keep what failed for the next flush, unless it has been overwritten since.
+            self._dirty = {**{key: dirty[key] for key in items}, **self._dirty}
+            raise
+
+    async def close(self):
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (CancelledError, Exception):
+                pass
+        try:
+            await self.flush()
+        finally:
+            await self.backend.close()
@@ -0,0 +1,70 @@
+from discord import AllowedMentions, Embed, InvalidArgument
+
+from typing import List, Union
+
+from .component import Component
+from .grid import ComponentGrid
+from .interaction import FlagsType, Interaction, InteractionType
+from .layout import Layout
+
+
+__all__ = ("ResponseTemplate",)
+
+
+class ResponseTemplate:
+    """A response whose embeds, components and flags are serialized once.
+
+    ``content`` may contain ``str.format`` fields that are filled in from the
+    keyword arguments of :meth:`respond`. The rest of the payload is shared
+    between responses, so later changes to the embeds or components are not
+    reflected in it.
+    """
+
+    __slots__ = ("type", "content", "allowed_mentions", "_data")
+
+    def __init__(
+        self,
+        content: str = None,
+        *,
+        type: int = InteractionType.ChannelMessageWithSource,
+        embed: Embed = None,
+        embeds: List[Embed] = None,
+        allowed_mentions: AllowedMentions = None,
+        tts: bool = False,
+        ephemeral: bool = True,
+        components: Union[Layout, ComponentGrid, List[Union[Component, List[Component]]]] = None,
+        validate: bool = True,
+    ):
+        self.type = type
+        self.content = content
+        self.allowed_mentions = allowed_mentions
+
+        data = {"flags": FlagsType.Ephemeral if ephemeral else 0, "tts": tts}
+        if content is not None:
+            data["content"] = content
+
+        embeds = [*(embeds or ()), *(() if embed is None else (embed,))]
+        if len(embeds) > 10:
+            raise InvalidArgument("Embed limit exceeded. (Max: 10)")
+        if embeds:
+            data["embeds"] = [embed.to_dict() for embed in embeds]
+
+        if isinstance(components, (Layout, ComponentGrid)):
+            data["components"] = components.to_dict()
+        elif components is not None:
+            data["components"] = Layout(*components, validate=validate).to_dict()
+
+        self._data = data
+
+    async def respond(self, interaction: Interaction, **variables) -> None:
+        data = self._data
+        if variables or self.allowed_mentions is not None:
+            data = data.copy()
+            if variables:
+                data["content"] = self.content.format_map(variables)
+            if self.allowed_mentions is not None:
+                data["allowed_mentions"] = interaction.client._allowed_mentions(
+                    self.allowed_mentions
+                )
+
+        await interaction._callback(self.type, data)
@@ -0,0 +1,135 @@
+from typing import List
+
+from .component import _invalid_argument
+
+
+__all__ = ("validate_components",)
+
+
+MAX_ROWS = 5
+MAX_BUTTONS_PER_ROW = 5
+MAX_CUSTOM_ID_LENGTH = 100
+MAX_BUTTON_LABEL_LENGTH = 80
+MAX_OPTIONS = 25
+MAX_OPTION_TEXT_LENGTH = 100
+MAX_PLACEHOLDER_LENGTH = 100
+
+URL_STYLE = 5
+
+
+def _check_custom_id(custom_id: str, where: str):
+    if not custom_id:
+        raise _invalid_argument(f"{where}: custom_id is required.")
+    if len(custom_id) > MAX_CUSTOM_ID_LENGTH:
+        raise _invalid_argument(
+            f"{where}: custom_id must be {MAX_CUSTOM_ID_LENGTH} or fewer characters."
+        )
+
+
+def _validate_button(data: dict, where: str):
+    style = data.get("style")
+    if not isinstance(style, int) or not (1 <= style <= URL_STYLE):
+        raise _invalid_argument(f"{where}: style must be between 1, {URL_STYLE}.")
+
+    if style == URL_STYLE:
+        if not data.get("url"):
+            raise _invalid_argument(f"{where}: you must provide a URL when the style is set to URL.")
+        if data.get("custom_id"):
+            raise _invalid_argument(f"{where}: both ID and URL are set.")
+    else:
+        _check_custom_id(data.get("custom_id"), where)
+
+    label = data.get("label")
+    if not label and not data.get("emoji"):
+        raise _invalid_argument(f"{where}: label or emoji must be given.")
+    if label and len(label) > MAX_BUTTON_LABEL_LENGTH:
+        raise _invalid_argument(
+            f"{where}: label must be {MAX_BUTTON_LABEL_LENGTH} or fewer characters."
+        )
+
+
+def _validate_select(data: dict, where: str):
+    _check_custom_id(data.get("custom_id"), where)
+
+    options = data.get("options") or ()
+    if not (1 <= len(options) <= MAX_OPTIONS):
+        raise _invalid_argument(f"{where}: options length should be between 1 and {MAX_OPTIONS}.")
+
+    placeholder = data.get("placeholder")
+    if placeholder and len(placeholder) > MAX_PLACEHOLDER_LENGTH:
+        raise _invalid_argument(
+            f"{where}: placeholder must be {MAX_PLACEHOLDER_LENGTH} or fewer characters."
+        )
+
+    min_values = data.get("min_values")
+    max_values = data.get("max_values")
+    if min_values is not None and not (0 <= min_values <= MAX_OPTIONS):
+        raise _invalid_argument(f"{where}: min_values must be between 0 and {MAX_OPTIONS}.")
+    if max_values is not None and not (1 <= max_values <= len(options)):
+        raise _invalid_argument(f"{where}: max_values must be between 1 and {len(options)}.")
+    if min_values is not None and max_values is not None and min_values > max_values:
+        raise _invalid_argument(f"{where}: min_values must not be greater than max_values.")
+
+    values = set()
+    for index, option in enumerate(options):
+        label = option.get("label")
+        value = option.get("value")
+        description = option.get("description")
+        if not label or len(label) > MAX_OPTION_TEXT_LENGTH:
+            raise _invalid_argument(
+                f"{where}.options[{index}]: label must be 1 to {MAX_OPTION_TEXT_LENGTH} characters."
+            )
+        if not value or len(value) > MAX_OPTION_TEXT_LENGTH:
+            raise _invalid_argument(
+                f"{where}.options[{index}]: value must be 1 to {MAX_OPTION_TEXT_LENGTH} characters."
+            )
+        if description and len(description) > MAX_OPTION_TEXT_LENGTH:
+            raise _invalid_argument(
+                f"{where}.options[{index}]: description must be {MAX_OPTION_TEXT_LENGTH} "
+                "or fewer characters."
+            )
+        if value in values:
+            raise _invalid_argument(f"{where}.options[{index}]: duplicate value {value!r}.")
+        values.add(value)
+
+
+_validators = {2: _validate_button, 3: _validate_select}
+
+
+def validate_components(rows: List[dict]) -> List[dict]:
+    """Checks serialized action rows against Discord's component limits.
+
+    Runs on the payload once, right before it is sent, so invalid layouts fail
+    locally instead of costing a request and a 400 response.
+    """
+    if len(rows) > MAX_ROWS:
+        raise _invalid_argument(f"A message can have at most {MAX_ROWS} action rows.")
+
+    custom_ids = set()
+    for row_index, row in enumerate(rows):
+        components = row["components"]
+        if not components:
+            raise _invalid_argument(f"components[{row_index}]: action row is empty.")
+        if len(components) > MAX_BUTTONS_PER_ROW:
+            raise _invalid_argument(
+                f"components[{row_index}]: an action row can have at most "
+                f"{MAX_BUTTONS_PER_ROW} buttons."
+            )
+
+        for index, component in enumerate(components):
+            where = f"components[{row_index}][{index}]"
+            validator = _validators.get(component.get("type"))
+            if validator is None:
+                raise _invalid_argument(f"{where}: unknown component type {component.get('type')}.")
+            if component["type"] == 3 and len(components) > 1:
+                raise _invalid_argument(f"{where}: a select must be alone in its action row.")
+
+            validator(component, where)
+
+            custom_id = component.get("custom_id")
+            if custom_id is not None:
+                if custom_id in custom_ids:
+                    raise _invalid_argument(f"{where}: duplicate custom_id {custom_id!r}.")
+                custom_ids.add(custom_id)
+
+    return rows
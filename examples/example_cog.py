@@ -1,5 +1,5 @@
 from discord.ext.commands import command, Cog
-from discord_components import DiscordComponents, Button, ButtonStyle, InteractionType
+from discord_components import DiscordComponents, Button, ButtonStyle, InteractionType, on_click
 
 
 class ExampleCog(Cog):
@@ -12,18 +12,18 @@ class ExampleCog(Cog):
             "Here is an example of a button",
             components=[
                 [
-                    Button(style=ButtonStyle.grey, label="EMOJI", emoji="😂"),
-                    Button(style=ButtonStyle.green, label="GREEN"),
-                    Button(style=ButtonStyle.red, label="RED"),
-                    Button(style=ButtonStyle.grey, label="GREY", disabled=True),
+                    Button(style=ButtonStyle.grey, label="EMOJI", emoji="😂", id="example:emoji"),
+                    Button(style=ButtonStyle.green, label="GREEN", id="example:green"),
+                    Button(style=ButtonStyle.red, label="RED", id="example:red"),
+                    Button(style=ButtonStyle.grey, label="GREY", id="example:grey", disabled=True),
                 ],
-                Button(style=ButtonStyle.blue, label="BLUE"),
+                Button(style=ButtonStyle.blue, label="BLUE", id="example:blue"),
                 Button(style=ButtonStyle.URL, label="URL", url="https://www.example.com"),
             ],
         )
 
-    @Cog.listener()
-    async def on_button_click(self, res):
+    @on_click("example:*")  # Every button whose id starts with "example:"
+    async def example_click(self, res):
         """
         Possible interaction types:
         - Pong
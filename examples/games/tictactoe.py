@@ -4,7 +4,7 @@ https://github.com/PythonSerious
 """
 import discord
 from discord.ext.commands import command, Cog
-from discord_components import DiscordComponents, Button, ButtonStyle, InteractionType
+from discord_components import DiscordComponents, Button, ButtonStyle, ComponentGrid, InteractionType
 import asyncio
 
 
@@ -24,75 +24,27 @@ class TicTacToe(Cog):
                 Button(style=ButtonStyle.red, label="Decline")
             ]
         ]
-        #
-        board = [
-            [
-                Button(style=ButtonStyle.grey, label="⠀", id="0 0"),
-                Button(style=ButtonStyle.grey, label="⠀", id="0 1"),
-                Button(style=ButtonStyle.grey, label="⠀", id="0 2")
-
+        board = ComponentGrid(
+            3,
+            3,
+            states=[
+                Button(style=ButtonStyle.grey, label="⠀"),
+                Button(style=ButtonStyle.green, label="⠀", disabled=True),
+                Button(style=ButtonStyle.red, label="⠀", disabled=True),
             ],
-            [
-                Button(style=ButtonStyle.grey, label="⠀", id="1 0"),
-                Button(style=ButtonStyle.grey, label="⠀", id="1 1"),
-                Button(style=ButtonStyle.grey, label="⠀", id="1 2")
+            prefix="tictactoe",
+        )
+        teams = {"green": 1, "red": 2}
+        creator = Button(style=ButtonStyle.URL, label="View creator", url="https://github.com/PythonSerious")
 
-            ],
-            [
-                Button(style=ButtonStyle.grey, label="⠀", id="2 0"),
-                Button(style=ButtonStyle.grey, label="⠀", id="2 1"),
-                Button(style=ButtonStyle.grey, label="⠀", id="2 2")
-            ]
-        ]
-        selections = [
-            [
-                "unchosen",
-                "unchosen",
-                "unchosen"
-            ],
-            [
-                "unchosen",
-                "unchosen",
-                "unchosen"
-            ],
-            [
-                "unchosen",
-                "unchosen",
-                "unchosen"
-            ]
-        ]
-        
         m = await ctx.send(embed=embed, components=acceptdenycomps, content=member.mention)
         def haswon(team):
-            if selections[0][0] == team and selections[0][1] == team and selections[0][2] == team:
-                return True
-            if selections[1][0] == team and selections[1][1] == team and selections[1][2] == team:
-                return True
-            if selections[2][0] == team and selections[2][1] == team and selections[2][2] == team:
-                return True
-            if selections[0][0] == team and selections[1][0] == team and selections[2][0] == team:
-                return True
-            if selections[0][1] == team and selections[1][1] == team and selections[2][1] == team:
-                return True
-            if selections[0][2] == team and selections[1][2] == team and selections[2][2] == team:
-                return True
-            if selections[0][0] == team and selections[1][1] == team and selections[2][2] == team:
-                return True
-            if selections[0][2] == team and selections[1][1] == team and selections[2][0] == team:
-                return True
-            else:
-                return False
-        def istie(team):
-            if not "unchosen" in str(selections):
-                if not haswon(team):
-
-                    return True
-                else:
+            line = (teams[team],) * 3
+            lines = [board.row(i) for i in range(3)] + [board.column(i) for i in range(3)]
+            return line in lines or line in board.diagonals()
 
-                    return False
-            else:
-
-                return False
+        def istie(team):
+            return board.count(0) == 0 and not haswon(team)
 
 
         def confirmcheck(res):
@@ -130,8 +82,8 @@ class TicTacToe(Cog):
                 color = discord.Colour.green()
                 user = ctx.author
             e = discord.Embed(color=color, title=f"{user.name} has won!")
-            board.append(Button(style=ButtonStyle.URL, label="View creator", url="https://github.com/PythonSerious"))
-            await m.edit(embed=e, components=board)
+            board.disabled = True
+            await m.edit(embed=e, components=[board, creator])
             return
 
             
@@ -150,18 +102,15 @@ class TicTacToe(Cog):
                 try:
                     res = await self.bot.wait_for("button_click", check=greensturncheck, timeout=50)
                     await res.respond(type=6)
-                    listid = res.component.id
-                    firstpart, secondpart = listid.split(' ')
-                    board[int(firstpart)][int(secondpart)] = Button(style=ButtonStyle.green, label="⠀", id="1 0", disabled=True)
-                    selections[int(firstpart)][int(secondpart)] = "green"
+                    board[board.locate(res.component.id)] = teams["green"]
                     if haswon('green'):
                         await winner('green')
                         accept = False
                         return
                     if istie('green'):
                         e = discord.Embed(color=0xF5F5F5, title=f"Call it a tie!")
-                        board.append(Button(style=ButtonStyle.URL, label="View creator", url="https://github.com/PythonSerious"))
-                        await m.edit(embed=e, components=board)
+                        board.disabled = True
+                        await m.edit(embed=e, components=[board, creator])
                         accept = False
                         return
                     greenstatus = False
@@ -182,19 +131,15 @@ class TicTacToe(Cog):
                 try:
                     res = await self.bot.wait_for("button_click", check=redsturncheck, timeout=50)
                     await res.respond(type=6)
-                    listid = res.component.id
-                    firstpart, secondpart = listid.split(' ')
-                    board[int(firstpart)][int(secondpart)] = Button(style=ButtonStyle.red, label="⠀", id="1 0",
-                                                                 disabled=True)
-                    selections[int(firstpart)][int(secondpart)] = "red"
+                    board[board.locate(res.component.id)] = teams["red"]
                     if haswon('red'):
                         await winner('red')
                         accept = False
                         return
                     if istie('red'):
                         e = discord.Embed(color=0xF5F5F5, title=f"Call it a tie!")
-                        board.append(Button(style=ButtonStyle.URL, label="View creator", url="https://github.com/PythonSerious"))
-                        await m.edit(embed=e, components=board)
+                        board.disabled = True
+                        await m.edit(embed=e, components=[board, creator])
                         accept = False
                         return
                         